@@ -2,6 +2,7 @@ from typing import Any
 
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
 
 from configs import get_logger, mongo_config
 from mongo.schemas import DocumentModels
@@ -10,11 +11,29 @@ from services.base_singleton import SingletonMeta
 logger = get_logger(__name__)
 
 
+class CommandCounter(monitoring.CommandListener):
+    """Count the commands (round trips) sent to MongoDB by this process."""
+
+    def __init__(self):
+        self.count: int = 0
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.count += 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
 class MongoClient(metaclass=SingletonMeta):
     def __init__(self):
+        self.command_counter: CommandCounter = CommandCounter()
         self.client: AsyncIOMotorClient[Any] = AsyncIOMotorClient(
             f"{mongo_config.uri}",
             uuidRepresentation="standard",
+            event_listeners=[self.command_counter],
         )
         self.database: str = str(mongo_config.db_name)
         self.db: AsyncIOMotorDatabase[Any] = self.client[self.database]
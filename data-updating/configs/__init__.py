@@ -8,7 +8,15 @@ from dotenv import load_dotenv
 from opentelemetry.instrumentation.logging import LoggingInstrumentor
 from pydantic import BaseModel
 
+from .aggregator_config import AggregatorConfig
+from .circuit_breaker_config import CircuitBreakerConfig
+from .http_cache_config import HTTPCacheConfig
+from .http_pool_config import HTTPPoolConfig, HTTPPoolProfile
+from .job_runner_config import JobRunnerConfig, JobsConfig
+from .metrics_config import MetricsConfig
 from .mongo_config import MongoConfig
+from .rate_limit_config import RateLimit, RateLimitConfig
+from .retention_config import RetentionConfig
 from .strategy_agent_config import StrategyAgentConfig
 from .vault_management_config import VaultManagementConfig
 
@@ -48,6 +56,14 @@ class AppConfig(BaseModel):
     mongo: MongoConfig
     strategy_agent: StrategyAgentConfig
     vault_management: VaultManagementConfig
+    aggregator: AggregatorConfig = AggregatorConfig()
+    http_cache: HTTPCacheConfig = HTTPCacheConfig()
+    http_pools: HTTPPoolConfig = HTTPPoolConfig()
+    rate_limits: RateLimitConfig = RateLimitConfig()
+    circuit_breaker: CircuitBreakerConfig = CircuitBreakerConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    retention: RetentionConfig = RetentionConfig()
+    jobs: JobsConfig = JobsConfig()
 
 
 def load_config(config_path: str = "app-config.yaml") -> AppConfig:
@@ -105,3 +121,11 @@ except Exception as e:
 mongo_config = _config.mongo if _config else None
 strategy_agent_config = _config.strategy_agent if _config else None
 vault_management_config = _config.vault_management if _config else None
+aggregator_config = _config.aggregator if _config else AggregatorConfig()
+http_cache_config = _config.http_cache if _config else HTTPCacheConfig()
+http_pool_config = _config.http_pools if _config else HTTPPoolConfig()
+rate_limit_config = _config.rate_limits if _config else RateLimitConfig()
+circuit_breaker_config = _config.circuit_breaker if _config else CircuitBreakerConfig()
+metrics_config = _config.metrics if _config else MetricsConfig()
+retention_config = _config.retention if _config else RetentionConfig()
+jobs_config = _config.jobs if _config else JobsConfig()
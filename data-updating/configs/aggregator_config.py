@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class AggregatorConfig(BaseModel):
+    chart_fetch_concurrency: int = 8  # max in-flight chart requests
+    incremental_charts: bool = True  # only parse chart points newer than the last run
+    dedupe_snapshots: bool = True  # skip snapshots whose content fingerprint is unchanged
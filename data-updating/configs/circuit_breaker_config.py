@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class CircuitBreakerConfig(BaseModel):
+    """Per-host circuit breaker of HTTPClient.get_response_async.
+
+    A circuit opens when at least `minimum_calls` requests completed in the last
+    `window_seconds` and `failure_rate_threshold` of them failed (connection
+    error, timeout or 5xx). It then fails calls immediately for `open_seconds`
+    before letting `half_open_max_calls` probes through.
+    """
+
+    enabled: bool = True
+    window_seconds: float = 60.0
+    minimum_calls: int = 5
+    failure_rate_threshold: float = 0.5
+    open_seconds: float = 30.0
+    half_open_max_calls: int = 1
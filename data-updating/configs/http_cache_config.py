@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class HTTPCacheConfig(BaseModel):
+    enabled: bool = True
+    directory: str = "shared/http_cache"  # relative to the project root
+    max_size_mb: int = 512
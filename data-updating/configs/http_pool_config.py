@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+class HTTPPoolProfile(BaseModel):
+    limit: int = 100  # max open connections of the pool
+    limit_per_host: int = 10  # max open connections to one host
+    keepalive_timeout: float = 30.0  # seconds an idle connection is kept
+    ttl_dns_cache: int = 300  # seconds a DNS resolution is cached
+    connect_timeout: float = 10.0  # seconds to acquire and open a connection
+    read_timeout: float = 60.0  # seconds between two reads of a response
+    total_timeout: float | None = 300.0  # seconds for a whole request
+
+
+class HTTPPoolConfig(BaseModel):
+    """Connection pool profile of each upstream, selected with `pool=` on HTTPClient calls."""
+
+    default: HTTPPoolProfile = HTTPPoolProfile()
+    defillama: HTTPPoolProfile = HTTPPoolProfile(limit_per_host=8)
+    strategy_engine: HTTPPoolProfile = HTTPPoolProfile(
+        limit_per_host=4, read_timeout=300.0, total_timeout=600.0
+    )
+    vault_management: HTTPPoolProfile = HTTPPoolProfile(limit_per_host=16)
+
+    def profile(self, name: str) -> HTTPPoolProfile:
+        profile = getattr(self, name, None)
+        if not isinstance(profile, HTTPPoolProfile):
+            raise ValueError(f"Unknown HTTP pool profile: {name}")
+        return profile
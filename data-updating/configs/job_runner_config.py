@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class JobRunnerConfig(BaseModel):
+    """Limits of one batch job run by engine.job_runner.JobRunner."""
+
+    concurrency: int = 4  # items processed at once
+    queue_size: int = 8  # items buffered ahead of the workers
+    timeout_seconds: float | None = 300.0  # per attempt, unlimited when unset
+    retries: int = 1  # attempts after the first one fails or times out
+    retry_backoff_seconds: float = 5.0  # doubled after each retry
+    deadline_seconds: float | None = None  # no item starts after it, unlimited when unset
+
+
+class JobsConfig(BaseModel):
+    # Rebalances are long LLM runs: keep `concurrency` at what strategy_engine
+    # can serve (and within http_pools.strategy_engine.limit_per_host), and the
+    # deadline short of the 3h schedule of the vaults strategy updater.
+    strategy_updating: JobRunnerConfig = JobRunnerConfig(
+        timeout_seconds=600.0, deadline_seconds=10200.0
+    )
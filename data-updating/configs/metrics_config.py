@@ -0,0 +1,11 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class MetricsConfig(BaseModel):
+    exporter: Literal["none", "otlp", "prometheus"] = "none"
+    otlp_endpoint: str = "http://localhost:4317"  # OTLP/gRPC collector
+    export_interval_seconds: float = 15.0  # OTLP push interval
+    prometheus_host: str = "0.0.0.0"  # bind address of the /metrics endpoint
+    prometheus_port: int = 9464
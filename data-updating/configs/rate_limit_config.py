@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class RateLimit(BaseModel):
+    requests_per_second: float
+    burst: int = 1  # requests that may start back to back after an idle period
+
+
+class RateLimitConfig(BaseModel):
+    """Outbound request rates per `host[:port]`, enforced by HTTPClient.get_response_async."""
+
+    enabled: bool = True
+    default: RateLimit | None = None  # limit of unlisted hosts, unlimited when unset
+    hosts: dict[str, RateLimit] = {
+        "yields.llama.fi": RateLimit(requests_per_second=5.0, burst=5),
+    }
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class RetentionConfig(BaseModel):
+    full_resolution_days: int = 14  # keep every snapshot this recent
+    daily_rollup_days: int = 90  # then one snapshot per pool per day, weekly after that
+    max_age_days: int = 730  # weekly rollups older than this are deleted
+    delete_batch_size: int = 1000  # ids removed per delete_many
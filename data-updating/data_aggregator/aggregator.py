@@ -1,25 +1,42 @@
 import asyncio
+import bisect
 import json
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
 
+from beanie.operators import In
 from pydantic import BaseModel
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from clients import Clients
-from configs import get_logger
+from configs import aggregator_config, get_logger
+from data_aggregator.charts import ChartColumns
+from data_aggregator.metrics import compute_pool_metrics
 from hooks.error import FailedExternalAPI, GenericServiceError
 from mongo.schemas import (
     APYStatistics,
-    PoolCharts,
+    PoolChartPoint,
+    PoolChartState,
+    PoolsLatest,
     PoolsMetdadata,
     PoolsSnapshot,
     Predictions,
 )
-from utils import hasher
+from utils import fingerprinter, hasher
 
 defillama = Clients.get_service_client().get_defillama_client()
 mongo_client = Clients.get_mongo_client()
 logger = get_logger("defillama_stable_solana_pools")
 
+CHART_URL = "https://yields.llama.fi/chart"
+
+# Ingested 30d chart window of each DeFiLlama pool id, kept between runs so
+# only the new points of a chart are parsed.
+_chart_windows: dict[str, ChartColumns] = {}
+
 
 def parse_iso_datetime_naive(date_str: str) -> datetime:
     if date_str.endswith("Z"):
@@ -27,77 +44,406 @@ def parse_iso_datetime_naive(date_str: str) -> datetime:
     return datetime.fromisoformat(date_str).replace(tzinfo=None)
 
 
-async def get_pool_charts_30d(pool_address: str) -> list[PoolCharts]:
-    url = f"https://yields.llama.fi/chart/{pool_address}"
+def _chart_timestamp(item: dict[str, Any]) -> datetime:
+    return parse_iso_datetime_naive(item["timestamp"])
+
+
+async def get_pool_charts_30d(
+    pool_address: str, since: datetime | None = None
+) -> ChartColumns:
+    """Fetch the chart points of a pool from the last 30 days.
+
+    DeFiLlama returns the chart in chronological order, so the first point to
+    keep is located with a binary search and only the points after it are
+    parsed, in bulk, into columns.
+
+    Args:
+        pool_address (str): DeFiLlama pool id.
+        since (datetime, optional): Only return points strictly newer than this timestamp.
+    """
+    url = f"{CHART_URL}/{pool_address}"
     try:
         response = await defillama.async_get_request(url=url)
         charts_data = response["data"]
         # Filter data for the last 30 days
         last_30d = datetime.utcnow() - timedelta(days=30)
-        # with open(f"debug_charts_{pool_address}.json", "w") as f:
-        #     json.dump(charts_data, f)
-        pool_charts_30d: list[PoolCharts] = []
-        for item in charts_data:
-            # Parse ISO format datetime string
-            ts = parse_iso_datetime_naive(item["timestamp"])
-            if ts >= last_30d:
-                pool_charts_30d.append(
-                    PoolCharts(
-                        timestamp=ts,
-                        tvlUsd=item["tvlUsd"],
-                        apy=item["apy"],
-                    )
-                )
-        return pool_charts_30d
+        start = bisect.bisect_left(charts_data, last_30d, key=_chart_timestamp)
+        if since is not None:
+            start = max(
+                start, bisect.bisect_right(charts_data, since, key=_chart_timestamp)
+            )
+        return ChartColumns.from_defillama(charts_data[start:])
     except (GenericServiceError, FailedExternalAPI) as e:
         logger.error(f"Error fetching pool charts for {pool_address}: {e}")
-        return []
+        raise
     except Exception as e:
         logger.error(f"Unexpected error fetching pool charts for {pool_address}: {e}")
-        return []
+        raise
+
+
+async def fetch_pool_charts(
+    pool_addresses: list[str], since: dict[str, datetime] | None = None
+) -> list[ChartColumns | BaseException]:
+    """Fetch the 30d charts of many pools concurrently.
+
+    At most `chart_fetch_concurrency` requests are in flight; their rate is
+    limited by the HTTP client's per-host `rate_limits`.
+
+    Args:
+        pool_addresses (list[str]): DeFiLlama pool ids.
+        since (dict, optional): Last ingested timestamp per pool id; only newer points are returned.
+
+    Returns:
+        list: One entry per pool, in the order of `pool_addresses`. A failed
+        pool yields its exception instead of its charts.
+    """
+    since = since or {}
+    semaphore = asyncio.Semaphore(aggregator_config.chart_fetch_concurrency)
+
+    async def fetch(pool_address: str) -> ChartColumns:
+        async with semaphore:
+            return await get_pool_charts_30d(pool_address, since.get(pool_address))
+
+    return await asyncio.gather(
+        *(fetch(pool_address) for pool_address in pool_addresses),
+        return_exceptions=True,
+    )
+
+
+async def get_chart_cursors(pool_addresses: list[str]) -> dict[str, datetime]:
+    """Load the last ingested chart timestamp of each pool.
+
+    Cursors are loaded even when `incremental_charts` is off, so that only the
+    points newer than them are written to `pool_charts`.
+    """
+    states = await PoolChartState.find(In(PoolChartState.id, pool_addresses)).to_list()
+    return {state.id: state.last_timestamp for state in states}
+
+
+async def get_chart_windows(
+    pool_names: dict[str, str], start: datetime
+) -> dict[str, ChartColumns]:
+    """Chart points already ingested since `start` for each pool id.
+
+    Windows are kept in memory between runs. Pools this process has not seen
+    yet are read from `pool_charts` with a single query.
+
+    Args:
+        pool_names (dict[str, str]): `pool_name` of each DeFiLlama pool id.
+        start (datetime): Oldest point to return.
+    """
+    missing = {
+        pool_name: pool_address
+        for pool_address, pool_name in pool_names.items()
+        if pool_address not in _chart_windows
+    }
+    if missing:
+        points = await PoolChartPoint.find(
+            In(PoolChartPoint.pool_name, list(missing)),
+            PoolChartPoint.timestamp >= start,
+        ).to_list()
+        points_by_pool: dict[str, list[PoolChartPoint]] = defaultdict(list)
+        for point in points:
+            points_by_pool[point.pool_name].append(point)
+        for pool_name, pool_address in missing.items():
+            _chart_windows[pool_address] = ChartColumns.from_chart_points(
+                points_by_pool[pool_name]
+            )
+    return {
+        pool_address: _chart_windows[pool_address].since(start)
+        for pool_address in pool_names
+    }
+
+
+def is_stable_solana_pool(pool: dict[str, Any]) -> bool:
+    return (
+        pool.get("chain") == "Solana"
+        and pool.get("stablecoin") == True
+        and pool.get("symbol") in ("USDT", "USDC")
+    )
+
+
+async def get_pool_names(pool_addresses: list[str]) -> dict[str, str]:
+    """Map each DeFiLlama pool id to its curated `final_name` in one query."""
+    pools_metadata = await PoolsMetdadata.find(
+        In(PoolsMetdadata.defillama_id, pool_addresses)
+    ).to_list()
+    return {
+        metadata.defillama_id: metadata.final_name
+        for metadata in pools_metadata
+        if metadata.defillama_id
+    }
+
+
+async def get_latest_states(pool_names: list[str]) -> dict[str, PoolsLatest]:
+    """Load the `pools_latest` entry of each pool in one query."""
+    states = await PoolsLatest.find(In(PoolsLatest.pool_name, pool_names)).to_list()
+    return {state.pool_name: state for state in states}
+
+
+def to_latest_state(snapshot: PoolsSnapshot, snapshot_id: UUID) -> PoolsLatest:
+    """Build the `pools_latest` entry of a pool from the snapshot of this run."""
+    return PoolsLatest(
+        snapshot_id=snapshot_id,
+        **snapshot.model_dump(
+            include={
+                "pool_name",
+                "update_at",
+                "chain",
+                "project",
+                "symbol",
+                "predictions",
+                "apy_statistics",
+                "apyPct1D",
+                "apyPct7D",
+                "apyPct30D",
+                "tvlUsd",
+                "apy",
+                "fingerprint",
+            }
+        ),
+    )
+
+
+def snapshot_fingerprint(
+    snapshot: PoolsSnapshot, latest_chart_timestamp: datetime | None
+) -> str:
+    """Fingerprint the content of a snapshot.
+
+    Chart points are append-only, so the timestamp of the newest ingested
+    point stands in for the chart data. The metrics derived from the 30-day
+    window are included too, as they change when old points leave it.
+    """
+    return fingerprinter.get_fingerprint(
+        {
+            "chain": snapshot.chain,
+            "project": snapshot.project,
+            "symbol": snapshot.symbol,
+            "pool_name": snapshot.pool_name,
+            "predictions": snapshot.predictions.model_dump(),
+            "apy_statistics": snapshot.apy_statistics.model_dump(),
+            "apyPct1D": snapshot.apyPct1D,
+            "apyPct7D": snapshot.apyPct7D,
+            "apyPct30D": snapshot.apyPct30D,
+            "tvlUsd": snapshot.tvlUsd,
+            "apy": snapshot.apy,
+            "latest_chart_timestamp": latest_chart_timestamp,
+        }
+    )
+
+
+def _failed_indexes(error: BulkWriteError) -> set[int]:
+    return {write_error["index"] for write_error in error.details["writeErrors"]}
+
+
+async def persist_ingest(
+    snapshots: list[PoolsSnapshot],
+    chart_points: list[tuple[str, PoolChartPoint]],
+    chart_cursors: dict[str, datetime],
+    latest_states: list[PoolsLatest] | None = None,
+    unchanged_snapshot_ids: list[UUID] | None = None,
+    seen_at: datetime | None = None,
+) -> set[str]:
+    """Write a whole run with one unordered bulk operation per collection.
+
+    Args:
+        snapshots (list[PoolsSnapshot]): New snapshots.
+        chart_points (list[tuple[str, PoolChartPoint]]): New chart points with their DeFiLlama pool id.
+        chart_cursors (dict[str, datetime]): New chart cursor per DeFiLlama pool id.
+        latest_states (list[PoolsLatest], optional): `pools_latest` entries to upsert.
+        unchanged_snapshot_ids (list[UUID], optional): Snapshots found unchanged by this run.
+        seen_at (datetime, optional): Written as `last_seen_at` on the unchanged snapshots.
+
+    Returns:
+        set[str]: Pools whose chart points could not be written; their cursor is not advanced.
+    """
+    failed_snapshot_pools: set[str] = set()
+    if snapshots:
+        try:
+            _ = await PoolsSnapshot.insert_many(snapshots, ordered=False)
+        except BulkWriteError as e:
+            for index in sorted(_failed_indexes(e)):
+                logger.error(
+                    f"Error saving snapshot for pool {snapshots[index].pool_name}"
+                )
+                failed_snapshot_pools.add(snapshots[index].pool_name)
+
+    latest_updates = [
+        UpdateOne(
+            {"pool_name": state.pool_name},
+            {"$set": state.model_dump(exclude={"id", "revision_id"})},
+            upsert=True,
+        )
+        for state in latest_states or []
+        if state.pool_name not in failed_snapshot_pools
+    ]
+    if latest_updates:
+        _ = await PoolsLatest.get_pymongo_collection().bulk_write(
+            latest_updates, ordered=False
+        )
+
+    if unchanged_snapshot_ids:
+        _ = await PoolsSnapshot.get_pymongo_collection().update_many(
+            {"_id": {"$in": unchanged_snapshot_ids}},
+            {"$set": {"last_seen_at": seen_at or datetime.utcnow()}},
+        )
+
+    failed_chart_pools: set[str] = set()
+    if chart_points:
+        try:
+            _ = await PoolChartPoint.insert_many(
+                [point for _, point in chart_points], ordered=False
+            )
+        except BulkWriteError as e:
+            failed_chart_pools = {chart_points[i][0] for i in _failed_indexes(e)}
+            logger.error(f"Error saving chart points for pools {failed_chart_pools}")
+
+    cursor_updates = [
+        UpdateOne({"_id": pool_id}, {"$set": {"last_timestamp": ts}}, upsert=True)
+        for pool_id, ts in chart_cursors.items()
+        if pool_id not in failed_chart_pools
+    ]
+    if cursor_updates:
+        _ = await PoolChartState.get_pymongo_collection().bulk_write(
+            cursor_updates, ordered=False
+        )
+    return failed_chart_pools
 
 
 async def aggregate_solana_stable_pools():
     url = "https://yields.llama.fi/pools"
     await mongo_client.initialize()
+    round_trips_before = mongo_client.command_counter.count
     try:
-        response = await defillama.async_get_request(url=url)
-        pools = response["data"]
-        solana_pools = [pool for pool in pools if pool["chain"] == "Solana"]
         stable_solana_pools = [
             pool
-            for pool in solana_pools
-            if pool["stablecoin"] == True
-            and (pool["symbol"] == "USDT" or pool["symbol"] == "USDC")
+            async for pool in defillama.async_stream_request(
+                url=url, predicate=is_stable_solana_pool
+            )
         ]
         logger.info(f"Found {len(stable_solana_pools)} stable Solana pools.")
-        for pool in stable_solana_pools:
-            pool_charts_30d = await get_pool_charts_30d(pool["pool"])
-            pool_predictions = Predictions.model_validate(pool["predictions"])
-            pool_apy_statistics = APYStatistics(
-                mu=pool["mu"], sigma=pool["sigma"], count=pool["count"]
+        pool_addresses = [pool["pool"] for pool in stable_solana_pools]
+        pool_names = await get_pool_names(pool_addresses)
+        chart_cursors = await get_chart_cursors(pool_addresses)
+        window_start = datetime.utcnow() - timedelta(days=30)
+        chart_windows = (
+            await get_chart_windows(
+                {
+                    address: pool_names.get(address, address)
+                    for address in pool_addresses
+                    if address in chart_cursors
+                },
+                window_start,
             )
-            update_time = datetime.utcnow().isoformat()
-            pool_metadata = await PoolsMetdadata.find_one(
-                PoolsMetdadata.defillama_id == pool["pool"]
+            if aggregator_config.incremental_charts
+            else {}
+        )
+        current_states = (
+            await get_latest_states(
+                [pool_names.get(address, address) for address in pool_addresses]
             )
-            pool_snapshot = PoolsSnapshot(
-                id=hasher.get_hash(f"{pool['symbol']}-{pool['project']}-{update_time}"),
-                chain=pool["chain"],
-                update_at=update_time,
-                project=pool["project"],
-                symbol=pool["symbol"],
-                pool_name=pool_metadata.final_name if pool_metadata else pool["pool"],
-                predictions=pool_predictions,
-                apy_statistics=pool_apy_statistics,
-                pool_charts_30d=pool_charts_30d,
+            if aggregator_config.dedupe_snapshots
+            else {}
+        )
+        all_pool_charts = await fetch_pool_charts(
+            pool_addresses,
+            chart_cursors if aggregator_config.incremental_charts else None,
+        )
+        update_time = datetime.utcnow()
+        snapshots: list[PoolsSnapshot] = []
+        unchanged_snapshot_ids: list[UUID] = []
+        latest_states: list[PoolsLatest] = []
+        chart_points: list[tuple[str, PoolChartPoint]] = []
+        new_cursors: dict[str, datetime] = {}
+        new_windows: dict[str, ChartColumns] = {}
+        failed_pools: list[str] = []
+        for pool, pool_charts_30d in zip(stable_solana_pools, all_pool_charts):
+            if isinstance(pool_charts_30d, BaseException):
+                logger.error(
+                    f"Skipping snapshot for pool {pool['pool']}: {pool_charts_30d!r}"
+                )
+                failed_pools.append(pool["pool"])
+                continue
+            try:
+                pool_predictions = Predictions.model_validate(pool["predictions"])
+                pool_apy_statistics = APYStatistics(
+                    mu=pool["mu"], sigma=pool["sigma"], count=pool["count"]
+                )
+                pool_name = pool_names.get(pool["pool"], pool["pool"])
+                stored_window = chart_windows.get(pool["pool"])
+                window = (
+                    stored_window.extend(pool_charts_30d).since(window_start)
+                    if stored_window is not None
+                    else pool_charts_30d
+                )
+                snapshot = PoolsSnapshot(
+                    id=hasher.get_hash(
+                        f"{pool['symbol']}-{pool['project']}-{pool['pool']}-{update_time.isoformat()}"
+                    ),
+                    chain=pool["chain"],
+                    update_at=update_time,
+                    project=pool["project"],
+                    symbol=pool["symbol"],
+                    pool_name=pool_name,
+                    predictions=pool_predictions,
+                    apy_statistics=pool_apy_statistics,
+                    **compute_pool_metrics(window).model_dump(),
+                )
+                new_points = pool_charts_30d.newer_than(
+                    chart_cursors.get(pool["pool"])
+                ).to_chart_points(pool_name)
+                chart_points.extend((pool["pool"], point) for point in new_points)
+                if new_points:
+                    new_cursors[pool["pool"]] = new_points[-1].timestamp
+                new_windows[pool["pool"]] = window
+
+                snapshot.fingerprint = snapshot_fingerprint(
+                    snapshot,
+                    new_cursors.get(pool["pool"], chart_cursors.get(pool["pool"])),
+                )
+                latest = current_states.get(pool_name)
+                if latest is not None and latest.fingerprint == snapshot.fingerprint:
+                    snapshot_id = latest.snapshot_id
+                    unchanged_snapshot_ids.append(snapshot_id)
+                else:
+                    snapshot_id = snapshot.id
+                    snapshots.append(snapshot)
+                latest_states.append(to_latest_state(snapshot, snapshot_id))
+            except Exception as e:
+                logger.error(f"Error building snapshot for pool {pool['pool']}: {e}")
+                failed_pools.append(pool["pool"])
+        failed_chart_pools = await persist_ingest(
+            snapshots,
+            chart_points,
+            new_cursors,
+            latest_states=latest_states,
+            unchanged_snapshot_ids=unchanged_snapshot_ids,
+            seen_at=update_time,
+        )
+        failed_pools.extend(failed_chart_pools)
+        # Keep the windows whose new points were stored, in step with the cursors.
+        if aggregator_config.incremental_charts:
+            _chart_windows.update(
+                (pool_address, window)
+                for pool_address, window in new_windows.items()
+                if pool_address not in failed_chart_pools
             )
-            _ = await pool_snapshot.save()
-            logger.info(f"Saved snapshot for pool {pool['pool']}.")
+        logger.info(
+            f"Saved {len(snapshots)} snapshots ({len(unchanged_snapshot_ids)} unchanged) and {len(chart_points)} chart points with failures: {failed_pools}"
+        )
     except (GenericServiceError, FailedExternalAPI) as e:
         logger.error(f"Error fetching pools data: {e}")
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
+    finally:
+        logger.info(
+            f"MongoDB round trips this run: {mongo_client.command_counter.count - round_trips_before}"
+        )
+        defillama_stats = defillama.http_client.get_connection_stats().get("defillama")
+        if defillama_stats is not None:
+            logger.info(
+                f"DeFiLlama connections: {defillama_stats.connections_created} created, {defillama_stats.connections_reused} reused for {defillama_stats.requests} requests"
+            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import numpy as np
+
+from mongo.schemas import PoolChartPoint
+
+
+@dataclass
+class ChartColumns:
+    """Chart points of one pool stored column-wise, sorted by timestamp.
+
+    Missing `tvlUsd`/`apy` values are stored as NaN.
+    """
+
+    timestamps: np.ndarray  # datetime64[ms], naive UTC
+    tvl_usd: np.ndarray  # float64
+    apy: np.ndarray  # float64
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_defillama(cls, items: list[dict[str, Any]]) -> ChartColumns:
+        """Parse DeFiLlama `/chart` items in bulk."""
+        raw_timestamps = np.array([item["timestamp"] for item in items], dtype=str)
+        return cls(
+            # DeFiLlama timestamps are UTC with a trailing "Z", which numpy does not parse.
+            timestamps=np.char.rstrip(raw_timestamps, "Z").astype("datetime64[ms]"),
+            tvl_usd=np.array([item.get("tvlUsd") for item in items], dtype=np.float64),
+            apy=np.array([item.get("apy") for item in items], dtype=np.float64),
+        )
+
+    @classmethod
+    def from_chart_points(cls, points: list[PoolChartPoint]) -> ChartColumns:
+        """Build columns from stored chart points, in any order."""
+        timestamps = np.array(
+            [point.timestamp for point in points], dtype="datetime64[ms]"
+        )
+        order = np.argsort(timestamps, kind="stable")
+        return cls(
+            timestamps=timestamps[order],
+            tvl_usd=np.array([point.tvlUsd for point in points], dtype=np.float64)[
+                order
+            ],
+            apy=np.array([point.apy for point in points], dtype=np.float64)[order],
+        )
+
+    def extend(self, newer: ChartColumns) -> ChartColumns:
+        """Append the points of `newer`, which all follow the points of these columns."""
+        return ChartColumns(
+            timestamps=np.concatenate([self.timestamps, newer.timestamps]),
+            tvl_usd=np.concatenate([self.tvl_usd, newer.tvl_usd]),
+            apy=np.concatenate([self.apy, newer.apy]),
+        )
+
+    def since(self, start: datetime) -> ChartColumns:
+        """Points at or after `start`, as views on these columns."""
+        index = int(
+            np.searchsorted(self.timestamps, to_datetime64(start), side="left")
+        )
+        return ChartColumns(
+            timestamps=self.timestamps[index:],
+            tvl_usd=self.tvl_usd[index:],
+            apy=self.apy[index:],
+        )
+
+    def select(self, mask: np.ndarray) -> ChartColumns:
+        return ChartColumns(
+            timestamps=self.timestamps[mask],
+            tvl_usd=self.tvl_usd[mask],
+            apy=self.apy[mask],
+        )
+
+    def newer_than(self, cursor: datetime | None) -> ChartColumns:
+        if cursor is None:
+            return self
+        return self.select(self.timestamps > np.datetime64(cursor, "ms"))
+
+    def values_at(
+        self,
+        targets: np.ndarray,
+        series: np.ndarray,
+        max_gap: timedelta,
+        use_linear_interpolation: bool = False,
+    ) -> np.ndarray:
+        """Return the value of `series` at each of the `targets` timestamps.
+
+        For each target:
+        - the exact point if one exists;
+        - a linear interpolation if enabled, the target is bracketed by two
+          points and neither is further than `max_gap`;
+        - otherwise the nearest left point within `max_gap`;
+        - otherwise the nearest right point within `max_gap`;
+        - otherwise NaN.
+        """
+        times = self.timestamps
+        n = len(times)
+        gap = np.timedelta64(max_gap, "ms")
+        idx = np.searchsorted(times, targets, side="left")
+        left = np.clip(idx - 1, 0, n - 1)
+        right = np.clip(idx, 0, n - 1)
+        left_ok = idx > 0
+        right_ok = idx < n
+        left_gap = targets - times[left]
+        right_gap = times[right] - targets
+
+        exact = right_ok & (times[right] == targets)
+        near_left = left_ok & (left_gap <= gap)
+        near_right = right_ok & (right_gap <= gap)
+
+        interpolated = np.full(len(targets), np.nan)
+        can_interpolate = np.zeros(len(targets), dtype=bool)
+        if use_linear_interpolation:
+            span = (times[right] - times[left]).astype(np.float64)
+            can_interpolate = near_left & near_right & (span > 0)
+            alpha = left_gap.astype(np.float64) / np.where(span > 0, span, 1.0)
+            interpolated = series[left] + alpha * (series[right] - series[left])
+
+        return np.select(
+            [exact, can_interpolate, near_left, near_right],
+            [series[right], interpolated, series[left], series[right]],
+            default=np.nan,
+        )
+
+    def to_chart_points(self, pool_name: str) -> list[PoolChartPoint]:
+        """Build one `PoolChartPoint` per distinct timestamp, keeping the last duplicate."""
+        if len(self) == 0:
+            return []
+        # `np.unique` keeps first occurrences, so search the reversed columns.
+        _, reversed_index = np.unique(self.timestamps[::-1], return_index=True)
+        index = len(self) - 1 - reversed_index
+        timestamps = self.timestamps[index].tolist()
+        tvl_usd = self.tvl_usd[index]
+        apy = self.apy[index]
+        return [
+            PoolChartPoint(
+                pool_name=pool_name,
+                timestamp=timestamp,
+                tvlUsd=None if np.isnan(tvl) else float(tvl),
+                apy=None if np.isnan(value) else float(value),
+            )
+            for timestamp, tvl, value in zip(timestamps, tvl_usd, apy)
+        ]
+
+
+def to_datetime64(value: datetime) -> np.datetime64:
+    """Convert a datetime to naive UTC `datetime64[ms]`."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "ms")
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from pydantic import BaseModel
+
+from data_aggregator.charts import ChartColumns, to_datetime64
+
+
+class PoolMetrics(BaseModel):
+    apyPct1D: float | None = None
+    apyPct7D: float | None = None
+    apyPct30D: float | None = None
+    tvlUsd: float | None = None
+    apy: float | None = None  # latest apy
+
+
+def _optional_float(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def compute_pool_metrics(
+    charts: ChartColumns,
+    now: datetime | None = None,
+    max_gap_hours: float = 12.0,
+    use_linear_interpolation: bool = False,
+) -> PoolMetrics:
+    """Derive the metrics stored on a pool snapshot from its recent chart.
+
+    - apyPct1D/7D/30D: change of the latest APY against the APY 1, 7 and 30
+      days before `now`, robust to uneven sampling.
+    - tvlUsd/apy: values at the latest point.
+
+    Args:
+        charts (ChartColumns): Chart points covering at least the last 30 days.
+        now (datetime, optional): Reference time. Defaults to the latest point.
+        max_gap_hours (float, optional): How far a point may be from a target time to be used.
+        use_linear_interpolation (bool, optional): Interpolate between the points around a target time.
+    """
+    if len(charts) == 0:
+        return PoolMetrics()
+
+    now64 = charts.timestamps[-1] if now is None else to_datetime64(now)
+    latest_apy = charts.apy[-1]
+    targets = now64 - np.array([1, 7, 30], dtype="timedelta64[D]")
+    past_apys = charts.values_at(
+        targets,
+        charts.apy,
+        max_gap=timedelta(hours=max_gap_hours),
+        use_linear_interpolation=use_linear_interpolation,
+    )
+    # Percentage change, undefined when the past value is missing or zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(
+            past_apys != 0, (latest_apy - past_apys) / past_apys * 100.0, np.nan
+        )
+    apy_pct_1d, apy_pct_7d, apy_pct_30d = (_optional_float(value) for value in pct)
+    return PoolMetrics(
+        apyPct1D=apy_pct_1d,
+        apyPct7D=apy_pct_7d,
+        apyPct30D=apy_pct_30d,
+        tvlUsd=_optional_float(charts.tvl_usd[-1]),
+        apy=_optional_float(latest_apy),
+    )
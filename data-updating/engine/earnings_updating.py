@@ -1,33 +1,30 @@
-import asyncio
 from datetime import datetime
 
 from clients import Clients
 from configs import get_logger, vault_management_config
 from hooks.error import FailedExternalAPI, GenericServiceError
-from mongo.schemas import UserBalanceHistory, UserMetadata, VaultsMetadata
 from services.http_request import HTTPMethod
 
 aiohttp_client = Clients().get_http_client().get_http_client()
-mongo_client = Clients().get_mongo_client()
 
 logger = get_logger("earnings_updating")
 
 
 class EarningsUpdating:
     @staticmethod
-    async def update_user_earnings(
-        user_wallet: str, vault_name: str, time_interval: float = 6.0
-    ):
+    async def update_user_earnings(user_wallet: str, vault_name: str):
         logger.info(f"Updating earnings for user: {user_wallet} in vault: {vault_name}")
         endpoint = f"http://{vault_management_config.url}:{vault_management_config.port}/user/balance/update_earnings"
         payload = {
             "user_wallet": user_wallet,
             "vault_name": vault_name,
-            "time_interval": time_interval,
         }
         try:
             response = await aiohttp_client.get_response_async(
-                method=HTTPMethod.POST, url=endpoint, data=payload
+                method=HTTPMethod.POST,
+                url=endpoint,
+                data=payload,
+                pool="vault_management",
             )
             logger.info(f"Earnings updated for user {user_wallet}: {response}")
         except (GenericServiceError, FailedExternalAPI) as e:
@@ -39,22 +36,15 @@ class EarningsUpdating:
 
     @staticmethod
     async def update_all_users_earnings():
-        await mongo_client.initialize()
-        users = await UserMetadata.find_all().to_list()
-        for user in users:
-            user_balance = (
-                await UserBalanceHistory.find(UserBalanceHistory.user.id == user.id)
-                .sort(-UserBalanceHistory.update_at)
-                .first_or_none()
+        """Checkpoint the earnings of every user position with one bulk call to vault-management."""
+        endpoint = f"http://{vault_management_config.url}:{vault_management_config.port}/user/balance/accrue_earnings"
+        try:
+            response = await aiohttp_client.get_response_async(
+                method=HTTPMethod.POST,
+                url=endpoint,
+                pool="vault_management",
             )
-            if user_balance:
-                vault = await VaultsMetadata.find_one(
-                    VaultsMetadata.id == user_balance.vault.id
-                )
-                if vault:
-                    _ = asyncio.create_task(
-                        EarningsUpdating.update_user_earnings(
-                            user.wallet_address, vault.name
-                        )
-                    )
-                    await asyncio.sleep(1)  # To avoid overwhelming the server
+            logger.info(f"Earnings accrued for all users: {response}")
+        except (GenericServiceError, FailedExternalAPI) as e:
+            logger.error(f"Error accruing earnings for all users: {str(e)}")
+            raise
@@ -0,0 +1,246 @@
+import asyncio
+import time
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from configs import JobRunnerConfig, get_logger
+from hooks.error import CircuitOpenError
+
+logger = get_logger("job_runner")
+
+T = TypeVar("T")
+
+
+class JobStatus(str, Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    SKIPPED = "skipped"  # not started before the deadline of the run
+    CANCELLED = "cancelled"
+
+
+class JobResult(BaseModel):
+    key: str
+    status: JobStatus
+    attempts: int  # 0 if the item was cancelled before being started
+    duration_seconds: float
+    error: str | None = None
+
+
+class JobReport(BaseModel):
+    """Outcome of a `JobRunner.run`, with one result per item."""
+
+    name: str
+    started_at: datetime
+    finished_at: datetime
+    results: list[JobResult]
+
+    @property
+    def failed(self) -> list[str]:
+        """Keys of the items that did not succeed."""
+        return [
+            result.key
+            for result in self.results
+            if result.status != JobStatus.SUCCEEDED
+        ]
+
+    def counts(self) -> dict[str, int]:
+        """Number of items per status."""
+        counts = {status.value: 0 for status in JobStatus}
+        for result in self.results:
+            counts[result.status.value] += 1
+        return counts
+
+
+class JobRunner(Generic[T]):
+    """Run an async job on many items with a bounded pool of workers.
+
+    Items are handed to `config.concurrency` workers through a queue holding at
+    most `config.queue_size` items, so reading items from an async iterable is
+    held back while the workers are busy. Each attempt is limited to
+    `config.timeout_seconds`; an item that fails or times out is retried
+    `config.retries` times with exponential backoff, unless it raised one of the
+    `non_retryable` errors. Items are started in the
+    order they are given; once `config.deadline_seconds` have passed, no item is
+    started or retried and the remaining ones are reported as skipped.
+
+    Cancelling `run`, e.g. when the Prefect flow is cancelled, cancels the items
+    in flight. They are reported as cancelled, along with the queued items, in
+    the log before the cancellation propagates.
+
+    Args:
+        name (str): Name of the job, used in logs and in the report.
+        job (Callable[[T], Awaitable[Any]]): Coroutine function run on each item.
+        config (JobRunnerConfig): Concurrency, queue size, timeout and retries.
+        key (Callable[[T], str], optional): Identifies an item in the report.
+            Defaults to `str`.
+        non_retryable (tuple[type[Exception], ...], optional): Errors that fail an
+            item at once. Defaults to `CircuitOpenError`, which is raised without
+            reaching an upstream known to be down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[T], Awaitable[Any]],
+        config: JobRunnerConfig,
+        key: Callable[[T], str] = str,
+        non_retryable: tuple[type[Exception], ...] = (CircuitOpenError,),
+    ):
+        self.name: str = name
+        self.job: Callable[[T], Awaitable[Any]] = job
+        self.config: JobRunnerConfig = config
+        self.key: Callable[[T], str] = key
+        self.non_retryable: tuple[type[Exception], ...] = non_retryable
+
+    async def run(self, items: Iterable[T] | AsyncIterable[T]) -> JobReport:
+        """Run the job on every item and wait for all of them to finish.
+
+        Failures of single items are recorded in the report and never raised.
+
+        Raises:
+            asyncio.CancelledError: If the run is cancelled.
+        """
+        started_at = datetime.utcnow()
+        deadline = (
+            time.monotonic() + self.config.deadline_seconds
+            if self.config.deadline_seconds is not None
+            else None
+        )
+        results: list[JobResult] = []
+        queue: asyncio.Queue[T] = asyncio.Queue(maxsize=self.config.queue_size)
+        workers = [
+            asyncio.create_task(self._worker(queue, results, deadline))
+            for _ in range(self.config.concurrency)
+        ]
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await queue.put(item)
+            else:
+                for item in items:
+                    await queue.put(item)
+            await queue.join()
+        except asyncio.CancelledError:
+            for worker in workers:
+                _ = worker.cancel()
+            _ = await asyncio.gather(*workers, return_exceptions=True)
+            while not queue.empty():
+                results.append(
+                    JobResult(
+                        key=self.key(queue.get_nowait()),
+                        status=JobStatus.CANCELLED,
+                        attempts=0,
+                        duration_seconds=0.0,
+                    )
+                )
+            report = self._report(started_at, results)
+            logger.warning(f"Job {self.name} cancelled: {report.counts()}")
+            raise
+        finally:
+            for worker in workers:
+                _ = worker.cancel()
+
+        report = self._report(started_at, results)
+        logger.info(f"Job {self.name} completed: {report.counts()}")
+        return report
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue[T],
+        results: list[JobResult],
+        deadline: float | None,
+    ):
+        while True:
+            item = await queue.get()
+            try:
+                if deadline is not None and time.monotonic() >= deadline:
+                    results.append(
+                        JobResult(
+                            key=self.key(item),
+                            status=JobStatus.SKIPPED,
+                            attempts=0,
+                            duration_seconds=0.0,
+                            error=f"Deadline of {self.config.deadline_seconds}s exceeded",
+                        )
+                    )
+                else:
+                    await self._run_item(item, results, deadline)
+            finally:
+                queue.task_done()
+
+    async def _run_item(
+        self, item: T, results: list[JobResult], deadline: float | None
+    ):
+        key = self.key(item)
+        start = time.perf_counter()
+        attempts = 0
+        try:
+            while True:
+                attempts += 1
+                try:
+                    _ = await asyncio.wait_for(
+                        self.job(item), self.config.timeout_seconds
+                    )
+                    results.append(
+                        JobResult(
+                            key=key,
+                            status=JobStatus.SUCCEEDED,
+                            attempts=attempts,
+                            duration_seconds=time.perf_counter() - start,
+                        )
+                    )
+                    return
+                except asyncio.TimeoutError:
+                    status = JobStatus.TIMED_OUT
+                    error = f"Timed out after {self.config.timeout_seconds}s"
+                    retryable = True
+                except Exception as e:
+                    status = JobStatus.FAILED
+                    error = repr(e)
+                    retryable = not isinstance(e, self.non_retryable)
+
+                backoff = self.config.retry_backoff_seconds * 2 ** (attempts - 1)
+                if (
+                    not retryable
+                    or attempts > self.config.retries
+                    or (deadline is not None and time.monotonic() + backoff >= deadline)
+                ):
+                    logger.error(f"Job {self.name} failed for {key}: {error}")
+                    results.append(
+                        JobResult(
+                            key=key,
+                            status=status,
+                            attempts=attempts,
+                            duration_seconds=time.perf_counter() - start,
+                            error=error,
+                        )
+                    )
+                    return
+                logger.warning(
+                    f"Job {self.name} attempt {attempts} failed for {key}: {error}."
+                    f" Retrying in {backoff}s."
+                )
+                await asyncio.sleep(backoff)
+        except asyncio.CancelledError:
+            results.append(
+                JobResult(
+                    key=key,
+                    status=JobStatus.CANCELLED,
+                    attempts=attempts,
+                    duration_seconds=time.perf_counter() - start,
+                )
+            )
+            raise
+
+    def _report(self, started_at: datetime, results: list[JobResult]) -> JobReport:
+        return JobReport(
+            name=self.name,
+            started_at=started_at,
+            finished_at=datetime.utcnow(),
+            results=results,
+        )
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Literal
+from uuid import UUID
+
+from clients import Clients
+from configs import get_logger, retention_config
+from mongo.schemas import PoolsLatest, PoolsSnapshot
+
+mongo_client = Clients().get_mongo_client()
+
+logger = get_logger("snapshot_retention")
+
+
+class SnapshotRetention:
+    """Downsample `pools_snapshot_v1` as it ages.
+
+    Snapshots newer than `full_resolution_days` are all kept. Older ones are
+    rolled up to the last snapshot of each pool per day until
+    `daily_rollup_days`, and to the last snapshot of each pool per week until
+    `max_age_days`. Snapshots older than that are deleted. Snapshots referenced
+    by `pools_latest` are never removed.
+    """
+
+    @staticmethod
+    def rollup_pipeline(
+        start: datetime | None, end: datetime, unit: Literal["day", "week"]
+    ) -> list[dict[str, Any]]:
+        """Ids of the snapshots in `[start, end)` that are not the last of their pool and bucket."""
+        update_at: dict[str, datetime] = {"$lt": end}
+        if start is not None:
+            update_at["$gte"] = start
+        bucket: dict[str, Any] = {"date": "$update_at", "unit": unit}
+        if unit == "week":
+            bucket["startOfWeek"] = "monday"
+        return [
+            {"$match": {"update_at": update_at}},
+            {"$sort": {"pool_name": 1, "update_at": -1}},
+            {
+                "$group": {
+                    "_id": {"pool_name": "$pool_name", "bucket": {"$dateTrunc": bucket}},
+                    "keep": {"$first": "$_id"},
+                    "ids": {"$push": "$_id"},
+                }
+            },
+            {"$project": {"_id": 0, "drop": {"$setDifference": ["$ids", ["$keep"]]}}},
+            {"$unwind": "$drop"},
+        ]
+
+    @staticmethod
+    async def delete_in_batches(ids: list[UUID]) -> int:
+        deleted = 0
+        collection = PoolsSnapshot.get_pymongo_collection()
+        for start in range(0, len(ids), retention_config.delete_batch_size):
+            batch = ids[start : start + retention_config.delete_batch_size]
+            result = await collection.delete_many({"_id": {"$in": batch}})
+            deleted += result.deleted_count
+        return deleted
+
+    @staticmethod
+    async def compact(
+        start: datetime | None,
+        end: datetime,
+        unit: Literal["day", "week"],
+        protected_ids: set[UUID],
+    ) -> int:
+        """Roll up the snapshots in `[start, end)` to one per pool and `unit`."""
+        pipeline = SnapshotRetention.rollup_pipeline(start, end, unit)
+        ids: list[UUID] = []
+        deleted = 0
+        async for row in PoolsSnapshot.aggregate(pipeline, allowDiskUse=True):
+            if row["drop"] in protected_ids:
+                continue
+            ids.append(row["drop"])
+            # Flush as the cursor is consumed so memory stays bounded.
+            if len(ids) >= retention_config.delete_batch_size:
+                deleted += await SnapshotRetention.delete_in_batches(ids)
+                ids = []
+        deleted += await SnapshotRetention.delete_in_batches(ids)
+        return deleted
+
+    @staticmethod
+    async def expire(end: datetime, protected_ids: set[UUID]) -> int:
+        """Delete the snapshots older than `end`."""
+        cursor = PoolsSnapshot.get_pymongo_collection().find(
+            {"update_at": {"$lt": end}}, {"_id": 1}
+        )
+        ids: list[UUID] = []
+        deleted = 0
+        async for row in cursor:
+            if row["_id"] in protected_ids:
+                continue
+            ids.append(row["_id"])
+            if len(ids) >= retention_config.delete_batch_size:
+                deleted += await SnapshotRetention.delete_in_batches(ids)
+                ids = []
+        deleted += await SnapshotRetention.delete_in_batches(ids)
+        return deleted
+
+    @staticmethod
+    async def apply_retention(now: datetime) -> dict[str, int]:
+        """Apply the retention policy relative to `now`.
+
+        Returns:
+            dict[str, int]: Number of snapshots deleted by the daily and weekly
+            rollups, and for exceeding the maximum age.
+        """
+        await mongo_client.initialize()
+        full_resolution_start = now - timedelta(
+            days=retention_config.full_resolution_days
+        )
+        daily_start = now - timedelta(days=retention_config.daily_rollup_days)
+        max_age_start = now - timedelta(days=retention_config.max_age_days)
+        if daily_start > full_resolution_start:
+            raise ValueError("daily_rollup_days must be >= full_resolution_days")
+        if max_age_start > daily_start:
+            raise ValueError("max_age_days must be >= daily_rollup_days")
+
+        protected_ids = {
+            state.snapshot_id for state in await PoolsLatest.find_all().to_list()
+        }
+        deleted = {
+            "daily": await SnapshotRetention.compact(
+                daily_start, full_resolution_start, "day", protected_ids
+            ),
+            "weekly": await SnapshotRetention.compact(
+                max_age_start, daily_start, "week", protected_ids
+            ),
+            "expired": await SnapshotRetention.expire(max_age_start, protected_ids),
+        }
+        logger.info(f"Snapshot retention at {now} deleted: {deleted}")
+        return deleted
+
+
+if __name__ == "__main__":
+    asyncio.run(SnapshotRetention.apply_retention(datetime.utcnow()))
@@ -1,11 +1,17 @@
-import asyncio
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
+from uuid import UUID
 
 from clients import Clients
-from configs import get_logger, strategy_agent_config, vault_management_config
+from configs import (
+    get_logger,
+    jobs_config,
+    strategy_agent_config,
+    vault_management_config,
+)
+from engine.job_runner import JobReport, JobRunner
 from hooks.error import FailedExternalAPI, GenericServiceError
-from mongo.schemas import StrategyInfo, VaultsMetadata
+from mongo.schemas import StrategyInfo, VaultsMetadata, VaultsStrategy
 from services.http_request import HTTPMethod
 
 aiohttp_client = Clients().get_http_client().get_http_client()
@@ -13,7 +19,9 @@ mongo_client = Clients().get_mongo_client()
 
 logger = get_logger("strategy_updating")
 
-root_time = datetime(2025, 9, 15, 0, 0, 0)
+# A vault whose refresh falls due within this margin is refreshed in this run
+# rather than waiting for the next one.
+due_margin = timedelta(minutes=20)
 
 
 class StrategyUpdating:
@@ -31,7 +39,10 @@ class StrategyUpdating:
             payload["policy"] = policy
         try:
             response = await aiohttp_client.get_response_async(
-                method=HTTPMethod.GET, url=endpoint, params=payload
+                method=HTTPMethod.GET,
+                url=endpoint,
+                params=payload,
+                pool="strategy_engine",
             )
             return StrategyInfo.model_validate(response)
         except (GenericServiceError, FailedExternalAPI) as e:
@@ -58,7 +69,10 @@ class StrategyUpdating:
             data = new_strategy.model_dump()
             # print(f"New strategy for vault {vault_name}: {data}")
             response = await aiohttp_client.get_response_async(
-                method=HTTPMethod.POST, url=endpoint, data=data
+                method=HTTPMethod.POST,
+                url=endpoint,
+                data=data,
+                pool="vault_management",
             )
             logger.info(f"Strategy updated for vault {vault_name}: {response}")
         except (GenericServiceError, FailedExternalAPI) as e:
@@ -71,27 +85,56 @@ class StrategyUpdating:
             raise
 
     @staticmethod
-    async def update_all_vault_strategy(update_time: datetime):
+    async def get_due_vaults(update_time: datetime) -> list[VaultsMetadata]:
+        """Vaults whose strategy is due for a refresh, most overdue first.
+
+        A vault is due `update_frequency` hours after its latest strategy, or
+        after its creation if it has none yet. The latest strategy time of every
+        vault is read with one aggregation.
+        """
+        vaults = await VaultsMetadata.find_all().to_list()
+        last_updates: dict[UUID, datetime] = {
+            row["_id"].id: row["update_at"]
+            for row in await VaultsStrategy.aggregate(
+                [{"$group": {"_id": "$vault", "update_at": {"$max": "$update_at"}}}]
+            ).to_list()
+        }
+        overdue: dict[UUID, timedelta] = {
+            vault.id: update_time
+            - last_updates.get(vault.id, vault.created_at)
+            - timedelta(hours=vault.update_frequency)
+            for vault in vaults
+        }
+        due_vaults = [vault for vault in vaults if overdue[vault.id] >= -due_margin]
+        due_vaults.sort(key=lambda vault: overdue[vault.id], reverse=True)
+        return due_vaults
+
+    @staticmethod
+    async def update_all_vault_strategy(update_time: datetime) -> JobReport:
+        """Refresh the strategy of every due vault, most overdue first.
+
+        Refreshes run concurrently within the limits and the deadline of
+        `jobs.strategy_updating`; vaults not started before the deadline are
+        reported as skipped and stay due for the next run.
+        """
         await mongo_client.initialize()
         logger.info(f"Starting update of all vault strategies at {update_time}")
-        vaults = await VaultsMetadata.find_all().to_list()
-        tasks_failed: list[str] = []
-        for vault in vaults:
-            if (update_time - root_time).seconds % (
-                vault.update_frequency * 3600
-            ) > 1200:
-                continue
-            try:
-                await StrategyUpdating.update_vault_strategy(
-                    vault_name=vault.name,
-                    token=vault.asset,
-                    risk_label=vault.risk_label,
-                    policy=vault.policy_prompt,
-                )
-                await asyncio.sleep(5)
-            except Exception:
-                tasks_failed.append(vault.name)
-                continue
+        due_vaults = await StrategyUpdating.get_due_vaults(update_time)
+        logger.info(f"{len(due_vaults)} vaults due: {[v.name for v in due_vaults]}")
+        # Requests are throttled per host by the HTTP client's rate limiter.
+        runner: JobRunner[VaultsMetadata] = JobRunner(
+            name="update_vault_strategy",
+            job=lambda vault: StrategyUpdating.update_vault_strategy(
+                vault_name=vault.name,
+                token=vault.asset,
+                risk_label=vault.risk_label,
+                policy=vault.policy_prompt,
+            ),
+            config=jobs_config.strategy_updating,
+            key=lambda vault: vault.name,
+        )
+        report = await runner.run(due_vaults)
         logger.info(
-            f"Completed update of all vault strategies with failures: {tasks_failed}"
+            f"Completed update of all vault strategies with failures: {report.failed}"
         )
+        return report
@@ -60,6 +60,17 @@ class FailedExternalAPI(_InternalError):
         super().__init__(detail)
 
 
+class CircuitOpenError(FailedExternalAPI):
+    """Raised without calling an upstream whose circuit breaker is open.
+
+    Args:
+        detail (str): The upstream and when it will be probed again.
+    """
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+
+
 class APIKeyServiceError(Exception):
     def __init__(self, status_code: int, message: str):
         self.status_code: int = status_code
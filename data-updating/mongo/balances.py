@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from mongo.schemas import UserBalanceHistory
+
+
+class LatestBalance(BaseModel):
+    """Latest `UserBalanceHistory` row of one (user, vault) position."""
+
+    id: UUID
+    user_id: UUID
+    vault_id: UUID
+    remaining_balance: float
+    earnings: float
+    update_at: datetime
+    apy: float | None
+
+
+async def get_latest_balances(vault_id: UUID | None = None) -> list[LatestBalance]:
+    """Return the latest balance row of every (user, vault) pair in one aggregation.
+
+    The `$sort` follows the `(user, vault, update_at desc)` index of
+    `users_balance_history`, so the latest row of each pair is read without an
+    in-memory sort.
+
+    Args:
+        vault_id (UUID, optional): Only return the positions of this vault.
+    """
+    match: dict[str, Any] = {}
+    if vault_id is not None:
+        match = {"vault.$id": vault_id}
+    rows = await UserBalanceHistory.aggregate(
+        [
+            {"$match": match},
+            {"$sort": {"user": 1, "vault": 1, "update_at": -1}},
+            {
+                "$group": {
+                    "_id": {"user": "$user", "vault": "$vault"},
+                    "id": {"$first": "$_id"},
+                    "remaining_balance": {"$first": "$remaining_balance"},
+                    "earnings": {"$first": "$earnings"},
+                    "update_at": {"$first": "$update_at"},
+                    "apy": {"$first": "$apy"},
+                }
+            },
+        ],
+        allowDiskUse=True,
+    ).to_list()
+    return [
+        LatestBalance(
+            id=row["id"],
+            user_id=row["_id"]["user"].id,
+            vault_id=row["_id"]["vault"].id,
+            remaining_balance=row["remaining_balance"],
+            earnings=row["earnings"],
+            update_at=row["update_at"],
+            apy=row["apy"],
+        )
+        for row in rows
+    ]
+
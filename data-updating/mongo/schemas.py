@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Any, Literal
 from uuid import UUID
 
-from beanie import Document, Link
+from beanie import Document, Granularity, Indexed, Link, TimeSeriesConfig
 from pydantic import BaseModel
 
 
@@ -18,12 +18,6 @@ class APYStatistics(BaseModel):
     count: int | None
 
 
-class PoolCharts(BaseModel):
-    timestamp: datetime
-    tvlUsd: float | None
-    apy: float | None
-
-
 class PoolsSnapshot(Document):
     id: UUID
     chain: str
@@ -33,11 +27,67 @@ class PoolsSnapshot(Document):
     pool_name: str
     predictions: Predictions
     apy_statistics: APYStatistics
-    pool_charts_30d: list[PoolCharts]
+    # Derived from the 30d chart at ingest, see `data_aggregator.metrics`
+    apyPct1D: float | None = None
+    apyPct7D: float | None = None
+    apyPct30D: float | None = None
+    tvlUsd: float | None = None
+    apy: float | None = None  # latest apy
+    fingerprint: str | None = None  # content hash, unchanged content is not re-inserted
+    last_seen_at: datetime | None = None  # last run that found the same content
 
     class Settings:
         name = "pools_snapshot_v1"
         validate_on_save = True
+        indexes = [[("pool_name", 1), ("update_at", -1)], [("update_at", 1)]]
+
+
+class PoolsLatest(Document):
+    """Newest state of each pool, upserted by the aggregator on every ingest."""
+
+    pool_name: Indexed(str, unique=True)  # pyright: ignore[reportInvalidTypeForm]
+    snapshot_id: UUID  # snapshot holding the same content
+    update_at: datetime  # last ingest that saw this content
+    chain: str
+    project: str
+    symbol: str
+    predictions: Predictions
+    apy_statistics: APYStatistics
+    apyPct1D: float | None = None
+    apyPct7D: float | None = None
+    apyPct30D: float | None = None
+    tvlUsd: float | None = None
+    apy: float | None = None  # latest apy
+    fingerprint: str | None = None
+
+    class Settings:
+        name = "pools_latest"
+        validate_on_save = True
+
+
+class PoolChartPoint(Document):
+    pool_name: str
+    timestamp: datetime
+    tvlUsd: float | None
+    apy: float | None
+
+    class Settings:
+        name = "pool_charts"
+        timeseries = TimeSeriesConfig(
+            time_field="timestamp",
+            meta_field="pool_name",
+            granularity=Granularity.hours,
+        )
+        indexes = [[("pool_name", 1), ("timestamp", -1)]]
+
+
+class PoolChartState(Document):
+    id: str  # DeFiLlama pool id
+    last_timestamp: datetime  # newest chart point already ingested
+
+    class Settings:
+        name = "pools_chart_state"
+        validate_on_save = True
 
 
 class PoolsMetdadata(Document):
@@ -160,14 +210,18 @@ class UserBalanceHistory(Document):
     remaining_balance: float
     earnings: float
     update_at: datetime
+    apy: float | None = None  # vault APY accruing since update_at, unset on older rows
 
     class Settings:
         name = "users_balance_history"
         validate_on_save = True
+        indexes = [[("user", 1), ("vault", 1), ("update_at", -1)]]
 
 
 DocumentModels = [
     PoolsSnapshot,
+    PoolsLatest,
+    PoolChartPoint,
     VaultsStrategy,
     VaultsHistory,
     VaultsUpdated,
@@ -176,4 +230,5 @@ DocumentModels = [
     UserMetadata,
     UserBalanceHistory,
     PoolsMetdadata,
+    PoolChartState,
 ]
@@ -7,7 +7,7 @@ from prefect.client.schemas.schedules import CronSchedule
 from prefect import aserve, flow
 from prefect.monitors import (
     defi_data_pipeline,
-    user_earnings_updater,
+    snapshot_retention,
     vaults_strategy_updater,
 )
 
@@ -63,16 +63,16 @@ async def deploy_flow():
                 schedule=CronSchedule(cron="0 */3 * * *"),  # Every 3 hours
             )
         )
-        user_earnings_updater_deployment = await user_earnings_updater.to_deployment(
-            name="user-earnings-updater",
-            tags=["user", "earnings", "updater"],
-            description="Updates earnings for all users.",
-            schedule=CronSchedule(cron="0 */6 * * *"),  # Every 6 hours
+        snapshot_retention_deployment = await snapshot_retention.to_deployment(
+            name="snapshot-retention",
+            tags=["defi", "data", "retention"],
+            description="Downsamples old pool snapshots to daily and weekly rollups.",
+            schedule=CronSchedule(cron="30 1 * * *"),  # Every day at 01:30
         )
         await aserve(
             defi_data_pipeline_deployment,
             vaults_strategy_updater_deployment,
-            user_earnings_updater_deployment,
+            snapshot_retention_deployment,
         )
         print("Deployment created successfully.")
     except Exception as e:
@@ -7,6 +7,7 @@ from clients import Clients
 from configs import get_logger
 from data_aggregator.aggregator import aggregate_solana_stable_pools
 from engine.earnings_updating import EarningsUpdating
+from engine.retention import SnapshotRetention
 from engine.strategy_updating import StrategyUpdating
 from prefect import flow, task
 
@@ -29,8 +30,9 @@ async def aggregate_data():
 async def update_strategy_for_all_vaults():
     logger.info("Starting strategy update task...")
     try:
-        await StrategyUpdating.update_all_vault_strategy(datetime.utcnow())
-        logger.info("Strategy update task completed successfully.")
+        report = await StrategyUpdating.update_all_vault_strategy(datetime.utcnow())
+        logger.info(f"Strategy update task completed: {report.counts()}")
+        return report
     except Exception as e:
         logger.error(f"Strategy update task failed: {e}")
         raise
@@ -47,6 +49,18 @@ async def update_earnings_for_all_users():
         raise
 
 
+@task(name="Apply Snapshot Retention")
+async def apply_snapshot_retention():
+    logger.info("Starting snapshot retention task...")
+    try:
+        deleted = await SnapshotRetention.apply_retention(datetime.utcnow())
+        logger.info(f"Snapshot retention task completed successfully: {deleted}")
+        return deleted
+    except Exception as e:
+        logger.error(f"Snapshot retention task failed: {e}")
+        raise
+
+
 @flow(
     name="DeFi Data Pipeline",
     description="Fetches data from DeFiLlama and aggregates protocol snapshots each 3h.",
@@ -69,8 +83,9 @@ async def defi_data_pipeline():
 async def vaults_strategy_updater():
     try:
         logger.info("Starting vaults strategy updater...")
-        _ = await update_strategy_for_all_vaults()
+        report = await update_strategy_for_all_vaults()
         logger.info("Vaults strategy updater completed.")
+        return report
     except Exception as e:
         logger.error(f"Vaults strategy updater failed: {e}")
         raise
@@ -78,7 +93,7 @@ async def vaults_strategy_updater():
 
 @flow(
     name="User Earnings Updater",
-    description="Updates earnings for all users every 6h.",
+    description="Checkpoints the earnings accrued by all users, on demand.",
 )
 async def user_earnings_updater():
     try:
@@ -88,3 +103,17 @@ async def user_earnings_updater():
     except Exception as e:
         logger.error(f"User earnings updater failed: {e}")
         raise
+
+
+@flow(
+    name="Snapshot Retention",
+    description="Downsamples old pool snapshots to daily and weekly rollups every day.",
+)
+async def snapshot_retention():
+    try:
+        logger.info("Starting snapshot retention...")
+        _ = await apply_snapshot_retention()
+        logger.info("Snapshot retention completed.")
+    except Exception as e:
+        logger.error(f"Snapshot retention failed: {e}")
+        raise
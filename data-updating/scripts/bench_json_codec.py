@@ -0,0 +1,98 @@
+"""Compare the JSON codec backends on payloads shaped like the services' traffic.
+
+Run from data-updating with `python -m scripts.bench_json_codec`.
+"""
+
+import json
+import random
+import timeit
+from typing import Any
+from uuid import UUID
+
+from services.json_codec import BACKEND, dumps, loads
+
+
+def pools_payload(n: int) -> dict[str, Any]:
+    """A DeFiLlama `/pools`-shaped response with `n` pools."""
+    chains = ["Ethereum", "Solana", "Arbitrum", "Base", "BSC"]
+    projects = ["aave-v3", "kamino-lend", "compound-v3", "morpho-blue", "marginfi"]
+    return {
+        "status": "success",
+        "data": [
+            {
+                "chain": random.choice(chains),
+                "project": random.choice(projects),
+                "symbol": random.choice(["USDC", "USDT", "WETH", "SOL"]),
+                "tvlUsd": random.uniform(1e4, 1e9),
+                "apyBase": random.uniform(0, 20),
+                "apyReward": random.choice([None, random.uniform(0, 5)]),
+                "apy": random.uniform(0, 25),
+                "rewardTokens": None,
+                "pool": str(UUID(int=random.getrandbits(128))),
+                "apyPct1D": random.uniform(-1, 1),
+                "apyPct7D": random.uniform(-3, 3),
+                "apyPct30D": random.uniform(-5, 5),
+                "stablecoin": True,
+                "ilRisk": "no",
+                "exposure": "single",
+                "predictions": {
+                    "predictedClass": "Stable/Up",
+                    "predictedProbability": random.randint(50, 100),
+                    "binnedConfidence": random.randint(1, 3),
+                },
+                "poolMeta": None,
+                "mu": random.uniform(0, 20),
+                "sigma": random.uniform(0, 1),
+                "count": random.randint(1, 1000),
+                "outlier": False,
+                "underlyingTokens": [str(UUID(int=random.getrandbits(128)))],
+                "il7d": None,
+                "apyBase7d": None,
+                "apyMean30d": random.uniform(0, 20),
+                "volumeUsd1d": None,
+                "volumeUsd7d": None,
+                "apyBaseInception": None,
+            }
+            for _ in range(n)
+        ],
+    }
+
+
+def strategy_payload(n_pools: int, n_messages: int) -> dict[str, Any]:
+    """A `StrategyInfo`-shaped strategy-engine `/vault/rebalance` response."""
+    return {
+        "strategy": {
+            "risk_label": "balanced",
+            "allocations": [
+                {"pool_name": f"USDC pool-{i}", "weight_pct": 100 / n_pools}
+                for i in range(n_pools)
+            ],
+        },
+        "reasoning_trace": [
+            {
+                "role": random.choice(["planner", "critic", "orchestrator"]),
+                "content": "Reviewed pool APY, TVL and risk profile. " * 20,
+                "status": "completed",
+            }
+            for _ in range(n_messages)
+        ],
+    }
+
+
+def bench(name: str, payload: dict[str, Any], number: int) -> None:
+    encoded = json.dumps(payload).encode()
+    results = {
+        "json.dumps": timeit.timeit(lambda: json.dumps(payload), number=number),
+        "json.loads": timeit.timeit(lambda: json.loads(encoded), number=number),
+        f"{BACKEND} dumps": timeit.timeit(lambda: dumps(payload), number=number),
+        f"{BACKEND} loads": timeit.timeit(lambda: loads(encoded), number=number),
+    }
+    print(f"{name} ({len(encoded) / 1024:.0f} KiB, {number} runs)")
+    for label, seconds in results.items():
+        print(f"  {label:<14} {seconds / number * 1e3:8.3f} ms/op")
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    bench("/pools x 10000", pools_payload(10_000), number=10)
+    bench("strategy x 6 pools", strategy_payload(6, 30), number=2_000)
@@ -0,0 +1,167 @@
+"""Count the MongoDB round trips of one aggregator run, per-pool writes vs batched writes.
+
+Both write paths store the same snapshots, chart points and chart cursors for
+`n` pools in a scratch `<db_name>_bench` database, which is dropped at the end.
+Needs the MongoDB of the app config.
+
+Run from data-updating with `python -m scripts.bench_mongo_round_trips [n ...]`.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from beanie import init_beanie
+
+from clients import Clients
+from configs import mongo_config
+from data_aggregator.aggregator import (
+    get_chart_cursors,
+    get_latest_states,
+    get_pool_names,
+    persist_ingest,
+    to_latest_state,
+)
+from mongo.schemas import (
+    APYStatistics,
+    DocumentModels,
+    PoolChartPoint,
+    PoolChartState,
+    PoolsLatest,
+    PoolsMetdadata,
+    PoolsSnapshot,
+    Predictions,
+)
+from utils import hasher
+
+POINTS_PER_POOL = 8  # new chart points per pool and run, about one day
+mongo_client = Clients.get_mongo_client()
+
+
+def pool_address(i: int) -> str:
+    return f"bench-pool-{i}"
+
+
+def build_snapshot(i: int, pool_name: str, update_time: datetime) -> PoolsSnapshot:
+    return PoolsSnapshot(
+        id=hasher.get_hash(f"USDC-bench-{pool_address(i)}-{update_time.isoformat()}"),
+        chain="Solana",
+        update_at=update_time,
+        project="bench",
+        symbol="USDC",
+        pool_name=pool_name,
+        predictions=Predictions(
+            predictedClass="Stable/Up", predictedProbability=80, binnedConfidence=2
+        ),
+        apy_statistics=APYStatistics(mu=5.0, sigma=0.5, count=100),
+        apy=5.0,
+        tvlUsd=1e6,
+    )
+
+
+def build_points(pool_name: str, update_time: datetime) -> list[PoolChartPoint]:
+    return [
+        PoolChartPoint(
+            pool_name=pool_name,
+            timestamp=update_time - timedelta(hours=3 * (POINTS_PER_POOL - k)),
+            tvlUsd=1e6,
+            apy=5.0,
+        )
+        for k in range(POINTS_PER_POOL)
+    ]
+
+
+async def per_pool_writes(n: int) -> None:
+    """The write path before batching: a few round trips per pool."""
+    addresses = [pool_address(i) for i in range(n)]
+    _ = await get_chart_cursors(addresses)
+    update_time = datetime.utcnow()
+    for i, address in enumerate(addresses):
+        metadata = await PoolsMetdadata.find_one(PoolsMetdadata.defillama_id == address)
+        pool_name = metadata.final_name if metadata else address
+        _ = await build_snapshot(i, pool_name, update_time).save()
+        points = build_points(pool_name, update_time)
+        _ = await PoolChartPoint.insert_many(points, ordered=False)
+        _ = await PoolChartState(id=address, last_timestamp=points[-1].timestamp).save()
+
+
+async def batched_writes(n: int) -> None:
+    """The aggregator's write path: one query or bulk write per collection."""
+    addresses = [pool_address(i) for i in range(n)]
+    pool_names = await get_pool_names(addresses)
+    _ = await get_chart_cursors(addresses)
+    _ = await get_latest_states(list(pool_names.values()))
+    update_time = datetime.utcnow()
+    snapshots: list[PoolsSnapshot] = []
+    chart_points: list[tuple[str, PoolChartPoint]] = []
+    cursors: dict[str, datetime] = {}
+    for i, address in enumerate(addresses):
+        pool_name = pool_names.get(address, address)
+        snapshots.append(build_snapshot(i, pool_name, update_time))
+        points = build_points(pool_name, update_time)
+        chart_points.extend((address, point) for point in points)
+        cursors[address] = points[-1].timestamp
+    _ = await persist_ingest(
+        snapshots,
+        chart_points,
+        cursors,
+        latest_states=[to_latest_state(s, s.id) for s in snapshots],
+        seen_at=update_time,
+    )
+
+
+async def reset(n: int) -> None:
+    for model in (PoolsSnapshot, PoolsLatest, PoolChartPoint, PoolChartState):
+        _ = await model.get_pymongo_collection().delete_many({})
+    _ = await PoolsMetdadata.get_pymongo_collection().delete_many({})
+    _ = await PoolsMetdadata.insert_many(
+        [
+            PoolsMetdadata(
+                id=uuid4(),
+                defillama_id=pool_address(i),
+                url=None,
+                project="bench",
+                name=None,
+                symbol="USDC",
+                chain="Solana",
+                final_name=f"USDC bench-{i}",
+            )
+            for i in range(n)
+        ]
+    )
+
+
+async def measure(write: Callable[[int], Awaitable[None]], n: int) -> tuple[int, float]:
+    await reset(n)
+    before = mongo_client.command_counter.count
+    start = time.perf_counter()
+    await write(n)
+    return mongo_client.command_counter.count - before, time.perf_counter() - start
+
+
+async def main(pool_counts: list[int]) -> None:
+    database = f"{mongo_config.db_name}_bench"
+    db = mongo_client.client[database]
+    await init_beanie(db, document_models=DocumentModels)
+    try:
+        print(
+            f"{'pools':>6} {'per-pool trips':>15} {'batched trips':>14} {'per-pool s':>11} {'batched s':>10}"
+        )
+        for n in pool_counts:
+            per_pool_trips, per_pool_seconds = await measure(per_pool_writes, n)
+            batched_trips, batched_seconds = await measure(batched_writes, n)
+            print(
+                f"{n:>6} {per_pool_trips:>15} {batched_trips:>14}"
+                f" {per_pool_seconds:>11.2f} {batched_seconds:>10.2f}"
+            )
+    finally:
+        await mongo_client.client.drop_database(database)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    _ = parser.add_argument("pools", nargs="*", type=int, default=[10, 100, 1000])
+    asyncio.run(main(parser.parse_args().pools))
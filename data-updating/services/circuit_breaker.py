@@ -0,0 +1,115 @@
+import time
+from collections import deque
+from enum import Enum
+from urllib.parse import urlsplit
+
+from configs import CircuitBreakerConfig, get_logger
+from hooks.error import CircuitOpenError
+
+logger = get_logger("circuit_breaker")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker of one upstream.
+
+    - closed: calls go through and their outcomes are kept for `window_seconds`.
+      The circuit opens once enough of them failed.
+    - open: calls fail immediately with `CircuitOpenError` for `open_seconds`.
+    - half-open: up to `half_open_max_calls` probes go through. A successful
+      probe closes the circuit, a failed one opens it again.
+
+    Usage: `state = breaker.acquire()` before the call, then
+    `breaker.record(state, success)` once its outcome is known, with
+    `success=None` when the call ended without reaching a verdict (e.g. cancelled).
+    """
+
+    def __init__(self, name: str, config: CircuitBreakerConfig):
+        self.name: str = name
+        self.config: CircuitBreakerConfig = config
+        self.state: CircuitState = CircuitState.CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at: float = 0.0
+        self._probes: int = 0
+
+    def acquire(self) -> CircuitState:
+        """Let a call through or raise `CircuitOpenError`.
+
+        Returns:
+            CircuitState: The state the call was admitted in, to pass to `record`.
+        """
+        if self.state == CircuitState.OPEN:
+            remaining = self._opened_at + self.config.open_seconds - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(
+                    f"Circuit for {self.name} is open, next probe in {remaining:.0f}s"
+                )
+            self._transition(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probes >= self.config.half_open_max_calls:
+                raise CircuitOpenError(
+                    f"Circuit for {self.name} is half-open and waiting for its probe"
+                )
+            self._probes += 1
+        return self.state
+
+    def record(self, admitted_in: CircuitState, success: bool | None) -> None:
+        """Record the outcome of a call admitted by `acquire`."""
+        now = time.monotonic()
+        if admitted_in == CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            if success is None or self.state != CircuitState.HALF_OPEN:
+                return
+            if success:
+                self._outcomes.clear()
+                self._transition(CircuitState.CLOSED)
+            else:
+                self._open(now)
+            return
+        # Calls started before the circuit opened do not affect it any more.
+        if success is None or self.state != CircuitState.CLOSED:
+            return
+
+        self._outcomes.append((now, success))
+        window_start = now - self.config.window_seconds
+        while self._outcomes and self._outcomes[0][0] < window_start:
+            _ = self._outcomes.popleft()
+        calls = len(self._outcomes)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if (
+            calls >= self.config.minimum_calls
+            and failures / calls >= self.config.failure_rate_threshold
+        ):
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._outcomes.clear()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self.state:
+            logger.warning(
+                f"Circuit for {self.name}: {self.state.value} -> {state.value}"
+            )
+            self.state = state
+
+
+class CircuitBreakers:
+    """One `CircuitBreaker` per upstream `host[:port]`."""
+
+    def __init__(self, config: CircuitBreakerConfig):
+        self.config: CircuitBreakerConfig = config
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host, self.config)
+        return breaker
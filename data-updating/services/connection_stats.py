@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+from aiohttp import (
+    ClientSession,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+    TraceRequestStartParams,
+)
+from pydantic import BaseModel
+
+
+class ConnectionStats(BaseModel):
+    """Connection usage of one aiohttp session."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        used = self.connections_created + self.connections_reused
+        return self.connections_reused / used if used else 0.0
+
+    def trace_config(self) -> TraceConfig:
+        """A TraceConfig that records the session's activity into these stats."""
+        trace_config = TraceConfig()
+
+        async def on_request_start(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceRequestStartParams,
+        ) -> None:
+            self.requests += 1
+
+        async def on_connection_create_end(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceConnectionCreateEndParams,
+        ) -> None:
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceConnectionReuseconnParams,
+        ) -> None:
+            self.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
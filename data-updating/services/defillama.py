@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator, Callable
 from typing import Any
 
 from configs import get_logger
@@ -19,7 +20,7 @@ class DeFiLlama:
     ) -> list[dict[str, Any]] | dict[str, any] | Any:
         try:
             response = await self.http_client.get_response_async(
-                url, method=method, params=params
+                url, method=method, params=params, pool="defillama"
             )
             return response
         except (GenericServiceError, FailedExternalAPI) as e:
@@ -28,3 +29,26 @@ class DeFiLlama:
         except Exception as e:
             logger.error(f"DeFiLlama async_get_request unexpected error: {e}")
             raise
+
+    async def async_stream_request(
+        self,
+        url: str,
+        item_key: str = "data",
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        try:
+            async for item in self.http_client.stream_json_items_async(
+                url,
+                item_key=item_key,
+                predicate=predicate,
+                params=params,
+                pool="defillama",
+            ):
+                yield item
+        except (GenericServiceError, FailedExternalAPI) as e:
+            logger.error(f"DeFiLlama async_stream_request error: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"DeFiLlama async_stream_request unexpected error: {e}")
+            raise
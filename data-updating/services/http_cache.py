@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from typing import BinaryIO
+
+from pydantic import BaseModel
+
+from configs import get_logger
+
+logger = get_logger("http_cache")
+
+_STALE_TEMP_SECONDS = 3600  # temporary files older than this were left by a crash
+
+
+class CacheEntry(BaseModel):
+    url: str
+    stored_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    max_age: float | None = None  # seconds the entry is fresh without revalidation
+    no_cache: bool = False  # always revalidate before use
+    size: int = 0
+
+    def is_fresh(self) -> bool:
+        if self.no_cache or self.max_age is None:
+            return False
+        return time.time() - self.stored_at < self.max_age
+
+    def validators(self) -> dict[str, str]:
+        """Headers to turn the next request into a conditional one."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+class HTTPCache:
+    """Size-bounded on-disk cache of GET response bodies with their validators.
+
+    Each entry is a `<key>.body` file holding the raw body and a `<key>.json`
+    file holding its `CacheEntry`. The least recently used entries are evicted
+    once the total body size exceeds `max_size_bytes`. Bodies are written to a
+    temporary file first and moved into place, so readers never see a partial
+    body.
+
+    Args:
+        directory (str): Where entries are stored. Created if missing.
+        max_size_bytes (int): Upper bound for the total size of stored bodies.
+    """
+
+    def __init__(self, directory: str, max_size_bytes: int):
+        self.directory: str = directory
+        self.max_size_bytes: int = max_size_bytes
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total_size: int = 0
+        self._lock: asyncio.Lock = asyncio.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def key(url: str, params: Mapping[str, str] | None = None) -> str:
+        raw = json.dumps([url, sorted((params or {}).items())])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    def _load_index(self) -> None:
+        entries: list[tuple[float, str, int]] = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                self._remove_stale_temp(name)
+                continue
+            if not name.endswith(".json"):
+                continue
+            key = name[: -len(".json")]
+            try:
+                body_stat = os.stat(self._path(key, "body"))
+                meta_mtime = os.stat(self._path(key, "json")).st_mtime
+            except FileNotFoundError:
+                continue
+            entries.append((meta_mtime, key, body_stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_size += size
+
+    def _remove_stale_temp(self, name: str) -> None:
+        """Remove a temporary file left by an interrupted write."""
+        path = os.path.join(self.directory, name)
+        try:
+            if time.time() - os.stat(path).st_mtime > _STALE_TEMP_SECONDS:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def get(self, key: str) -> tuple[CacheEntry, bytes] | None:
+        if key not in self._index:
+            return None
+        try:
+            entry, body = await asyncio.to_thread(self._read, key)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            async with self._lock:
+                self._remove(key)
+            return None
+        self._index.move_to_end(key)
+        return entry, body
+
+    async def get_entry(self, key: str) -> CacheEntry | None:
+        """Like `get`, without reading the body."""
+        if key not in self._index:
+            return None
+        try:
+            entry = await asyncio.to_thread(self._read_meta, key)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            async with self._lock:
+                self._remove(key)
+            return None
+        self._index.move_to_end(key)
+        return entry
+
+    async def iter_body(self, key: str, chunk_size: int) -> AsyncIterator[bytes]:
+        """Read the stored body of an entry in chunks of at most `chunk_size` bytes.
+
+        Raises:
+            OSError: If the entry was evicted since its metadata was read.
+        """
+        f = await asyncio.to_thread(open, self._path(key, "body"), "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+        finally:
+            f.close()
+
+    def _read(self, key: str) -> tuple[CacheEntry, bytes]:
+        entry = self._read_meta(key)
+        with open(self._path(key, "body"), "rb") as f:
+            body = f.read()
+        return entry, body
+
+    def _read_meta(self, key: str) -> CacheEntry:
+        meta_path = self._path(key, "json")
+        with open(meta_path, "r") as f:
+            entry = CacheEntry.model_validate_json(f.read())
+        os.utime(meta_path)  # recency survives restarts
+        return entry
+
+    async def put(
+        self, key: str, url: str, body: bytes, headers: Mapping[str, str]
+    ) -> None:
+        """Store a 200 response unless its Cache-Control forbids it or it cannot be reused."""
+        if len(body) > self.max_size_bytes:
+            return
+        entry = self._entry_from_headers(url, headers, size=len(body))
+        if entry is None:
+            return
+        await asyncio.to_thread(self._write, key, entry, body)
+        await self._add(key, entry.size)
+
+    async def open_writer(self, key: str, url: str) -> CacheWriter:
+        """Start storing a 200 response whose body is read in chunks."""
+        fd, path = await asyncio.to_thread(
+            tempfile.mkstemp, prefix=f"{key}.", suffix=".tmp", dir=self.directory
+        )
+        return CacheWriter(self, key, url, os.fdopen(fd, "wb"), path)
+
+    async def _commit(
+        self,
+        key: str,
+        url: str,
+        temp_path: str,
+        size: int,
+        headers: Mapping[str, str],
+    ) -> None:
+        entry = self._entry_from_headers(url, headers, size=size)
+        if entry is None:
+            await asyncio.to_thread(_remove_file, temp_path)
+            return
+        await asyncio.to_thread(self._install, key, entry, temp_path)
+        await self._add(key, entry.size)
+
+    async def _add(self, key: str, size: int) -> None:
+        async with self._lock:
+            self._total_size -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._total_size += size
+            while self._total_size > self.max_size_bytes and self._index:
+                oldest = next(iter(self._index))
+                self._remove(oldest)
+
+    async def refresh(
+        self, key: str, entry: CacheEntry, headers: Mapping[str, str]
+    ) -> None:
+        """Update the freshness of an entry after a 304 Not Modified."""
+        refreshed = self._entry_from_headers(entry.url, headers, size=entry.size)
+        if refreshed is None:
+            async with self._lock:
+                self._remove(key)
+            return
+        refreshed.etag = refreshed.etag or entry.etag
+        refreshed.last_modified = refreshed.last_modified or entry.last_modified
+        await asyncio.to_thread(self._write_meta, key, refreshed)
+
+    def _entry_from_headers(
+        self, url: str, headers: Mapping[str, str], size: int
+    ) -> CacheEntry | None:
+        cache_control = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in cache_control or "private" in cache_control:
+            return None
+        max_age: float | None = None
+        if cache_control.get("max-age") is not None:
+            try:
+                age = float(headers.get("Age", 0))
+                max_age = max(0.0, float(cache_control["max-age"]) - age)
+            except ValueError:
+                max_age = None
+        entry = CacheEntry(
+            url=url,
+            stored_at=time.time(),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            max_age=max_age,
+            no_cache="no-cache" in cache_control,
+            size=size,
+        )
+        if not (entry.etag or entry.last_modified or entry.max_age):
+            return None  # neither fresh nor revalidatable
+        return entry
+
+    def _write(self, key: str, entry: CacheEntry, body: bytes) -> None:
+        body_path = self._path(key, "body")
+        with open(body_path + ".tmp", "wb") as f:
+            _ = f.write(body)
+        self._install(key, entry, body_path + ".tmp")
+
+    def _install(self, key: str, entry: CacheEntry, temp_path: str) -> None:
+        os.replace(temp_path, self._path(key, "body"))
+        self._write_meta(key, entry)
+
+    def _write_meta(self, key: str, entry: CacheEntry) -> None:
+        meta_path = self._path(key, "json")
+        with open(meta_path + ".tmp", "w") as f:
+            _ = f.write(entry.model_dump_json())
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _remove(self, key: str) -> None:
+        self._total_size -= self._index.pop(key, 0)
+        for suffix in ("json", "body"):
+            _remove_file(self._path(key, suffix))
+
+
+class CacheWriter:
+    """Body of a response being stored in an `HTTPCache` while it is streamed.
+
+    Chunks are appended to a temporary file in the cache directory. `commit`
+    moves the file into place once the body has been read to the end, and
+    `discard` drops it; both are no-ops once the writer is closed. A body
+    larger than the whole cache is discarded as soon as it exceeds it.
+    """
+
+    def __init__(self, cache: HTTPCache, key: str, url: str, file: BinaryIO, path: str):
+        self.cache: HTTPCache = cache
+        self.key: str = key
+        self.url: str = url
+        self.size: int = 0
+        self._file: BinaryIO | None = file
+        self._path: str = path
+
+    async def write(self, chunk: bytes) -> None:
+        if self._file is None:
+            return
+        self.size += len(chunk)
+        if self.size > self.cache.max_size_bytes:
+            await self.discard()
+            return
+        _ = await asyncio.to_thread(self._file.write, chunk)
+
+    async def commit(self, headers: Mapping[str, str]) -> None:
+        """Store the body written so far with the validators in `headers`."""
+        if self._file is None:
+            return
+        f, self._file = self._file, None
+        await asyncio.to_thread(f.close)
+        await self.cache._commit(self.key, self.url, self._path, self.size, headers)
+
+    async def discard(self) -> None:
+        if self._file is None:
+            return
+        f, self._file = self._file, None
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(_remove_file, self._path)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
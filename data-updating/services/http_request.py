@@ -1,22 +1,40 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
 from enum import Enum
 from typing import Any
 
 import aiohttp
-import ujson
-from aiohttp import ClientError, ClientSession, ClientTimeout
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
 from requests import Session
 from requests.exceptions import RequestException
 
-from configs import get_logger
+from configs import (
+    circuit_breaker_config,
+    get_logger,
+    http_cache_config,
+    http_pool_config,
+    metrics_config,
+    rate_limit_config,
+)
 from hooks.error import (
     FailedExternalAPI,
     GenericServiceError,
     ServicesAuthenticationError,
 )
+from services import json_codec
 from services.base_singleton import SingletonMeta
+from services.circuit_breaker import CircuitBreakers
+from services.connection_stats import ConnectionStats
+from services.http_cache import CacheEntry, CacheWriter, HTTPCache
+from services.json_stream import iter_json_array
+from services.metrics import HTTPMetrics, RequestMeasurement, setup_metrics
+from services.rate_limiter import HostRateLimiter
+from services.retry import RetryPolicy
+from services.singleflight import SingleFlight
 
 logger = get_logger("http_client")
 
@@ -30,20 +48,76 @@ class HTTPMethod(str, Enum):
 
 class HTTPClient(metaclass=SingletonMeta):
     _instance: HTTPClient | None = None
-    _aiohttp_session: ClientSession | None = None
     _requests_session: Session | None = None
-    _max_retries: int = 1
+    _http_cache: HTTPCache | None = None
+    _retry_policy: RetryPolicy = RetryPolicy()
+    _stream_chunk_size: int = 64 * 1024
+
+    def __init__(self):
+        self._aiohttp_sessions: dict[str, ClientSession] = {}
+        self._connection_stats: dict[str, ConnectionStats] = {}
+        self._singleflight: SingleFlight = SingleFlight()
+        setup_metrics(metrics_config)
+        self._metrics: HTTPMetrics = HTTPMetrics()
+        self._circuit_breakers: CircuitBreakers | None = (
+            CircuitBreakers(circuit_breaker_config)
+            if circuit_breaker_config.enabled
+            else None
+        )
+        self._rate_limiter: HostRateLimiter | None = (
+            HostRateLimiter(rate_limit_config.hosts, rate_limit_config.default)
+            if rate_limit_config.enabled
+            else None
+        )
 
     @classmethod
     def get_instance(cls) -> HTTPClient:
         instance = cls()
         return instance
 
-    async def get_aiohttp_session(self) -> ClientSession:
-        if self._aiohttp_session is None or self._aiohttp_session.closed:
-            timeout = ClientTimeout(total=300)
-            self._aiohttp_session = aiohttp.ClientSession(timeout=timeout)
-        return self._aiohttp_session
+    async def get_aiohttp_session(self, pool: str = "default") -> ClientSession:
+        """Get the session of a connection pool profile from `http_pools` in the app config."""
+        session = self._aiohttp_sessions.get(pool)
+        if session is None or session.closed:
+            profile = http_pool_config.profile(pool)
+            connector = TCPConnector(
+                limit=profile.limit,
+                limit_per_host=profile.limit_per_host,
+                keepalive_timeout=profile.keepalive_timeout,
+                ttl_dns_cache=profile.ttl_dns_cache,
+            )
+            timeout = ClientTimeout(
+                total=profile.total_timeout,
+                sock_connect=profile.connect_timeout,
+                sock_read=profile.read_timeout,
+            )
+            stats = self._connection_stats.setdefault(pool, ConnectionStats())
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                trace_configs=[stats.trace_config()],
+                json_serialize=json_codec.dumps_str,
+            )
+            self._aiohttp_sessions[pool] = session
+        return session
+
+    def get_connection_stats(self) -> dict[str, ConnectionStats]:
+        """Requests and created/reused connections of each pool since startup."""
+        return dict(self._connection_stats)
+
+    def get_http_cache(self) -> HTTPCache | None:
+        if not http_cache_config.enabled:
+            return None
+        if self._http_cache is None:
+            directory = http_cache_config.directory
+            if not os.path.isabs(directory):
+                directory = os.path.abspath(
+                    os.path.join(os.path.dirname(__file__), "..", directory)
+                )
+            self._http_cache = HTTPCache(
+                directory, http_cache_config.max_size_mb * 1024 * 1024
+            )
+        return self._http_cache
 
     def get_requests_session(self) -> Session:
         if self._requests_session is None:
@@ -55,9 +129,19 @@ class HTTPClient(metaclass=SingletonMeta):
         _ = self.get_requests_session()
 
     async def close_sessions(self):
-        if self._aiohttp_session and not self._aiohttp_session.closed:
-            await self._aiohttp_session.close()
-            self._aiohttp_session = None
+        for pool, session in self._aiohttp_sessions.items():
+            if not session.closed:
+                await session.close()
+            stats = self._connection_stats.get(pool)
+            if stats is not None:
+                logger.info(
+                    f"HTTP pool '{pool}': {stats.requests} requests, {stats.connections_created} connections created, {stats.connections_reused} reused"
+                )
+        self._aiohttp_sessions.clear()
+        if self._singleflight.coalesced:
+            logger.info(
+                f"{self._singleflight.coalesced} GET requests shared an in-flight identical request"
+            )
         if self._requests_session:
             self._requests_session.close()
             self._requests_session = None
@@ -99,15 +183,20 @@ class HTTPClient(metaclass=SingletonMeta):
         params: dict[str, Any] | None = None,
         data: dict[str, Any] | None = None,
         method: HTTPMethod = HTTPMethod.GET,
+        retry_policy: RetryPolicy | None = None,
     ) -> dict[str, Any] | list[Any] | Any:
         """Get the response synchronously from a specified URL
 
+        Connection errors, timeouts and transient statuses (429, 5xx) are
+        retried for idempotent methods according to the retry policy.
+
         Args:
             url (str): The API URL.
             method (HTTPMethod): HTTP method.
             headers (dict): Request headers including authorization.
             params (dict, optional): Query parameters. Defaults to dict empty.
             data (dict, optional): JSON payload for POST requests. Defaults to dict empty.
+            retry_policy (RetryPolicy, optional): Overrides the client's default retry policy.
 
         Raises:
             FailedExternalAPI: If API call fails.
@@ -118,36 +207,46 @@ class HTTPClient(metaclass=SingletonMeta):
         params = self._normalize_params(params or {})
         if data is None:
             data = {}
+        policy = retry_policy or self._retry_policy
+        attempts = policy.attempts_for(method.value)
 
         session = self.get_requests_session()
         session.headers.update(headers)
-        for attempt in range(1, self._max_retries + 1):
+        for attempt in range(1, attempts + 1):
             try:
-                if method == HTTPMethod.GET:
-                    response = session.get(url, params=params)
-                elif method == HTTPMethod.POST:
-                    response = session.post(url, params=params, json=data)
-                elif method == HTTPMethod.PUT:
-                    response = session.put(url, params=params, json=data)
-                elif method == HTTPMethod.DELETE:
-                    response = session.delete(url, params=params)
-
-                try:
-                    response_data = response.json()
-                except json.JSONDecodeError:
-                    raise FailedExternalAPI(f"Invalid JSON response from {url}")
-
-                self._handle_response_error(response.status_code, url, response_data)
-                return response_data
-
+                with self._metrics.request(url, method.value) as measurement:
+                    response = session.request(
+                        method.value,
+                        url,
+                        params=params,
+                        **self._encode_body(method, data),
+                    )
+                    measurement.status_code = response.status_code
+                    measurement.body_size = len(response.content)
             except RequestException as e:
                 logger.error(
-                    f"[Attempt {attempt}] Sync HTTP request to {url} failed: {e}"
+                    f"[Attempt {attempt}/{attempts}] Sync HTTP request to {url} failed: {e}"
                 )
-                if attempt >= self._max_retries:
+                if attempt >= attempts:
                     raise FailedExternalAPI(
-                        f"Sync HTTP request to {url} failed after {self._max_retries} retries: {e}"
+                        f"Sync HTTP request to {url} failed after {attempts} attempts: {e}"
                     )
+                self._metrics.retry(url, method.value, type(e).__name__)
+                time.sleep(policy.delay(attempt))
+                continue
+
+            if attempt < attempts and policy.should_retry_status(response.status_code):
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(
+                    f"[Attempt {attempt}/{attempts}] Status {response.status_code} from {url}, retrying in {delay:.2f}s"
+                )
+                self._metrics.retry(url, method.value, str(response.status_code))
+                time.sleep(delay)
+                continue
+
+            response_data = self._parse_body(url, response.status_code, response.content)
+            self._handle_response_error(response.status_code, url, response_data)
+            return response_data
 
     async def get_response_async(
         self,
@@ -156,18 +255,40 @@ class HTTPClient(metaclass=SingletonMeta):
         params: dict[str, Any] | None = None,
         data: dict[str, Any] | None = None,
         method: HTTPMethod = HTTPMethod.GET,
+        cache: bool = True,
+        retry_policy: RetryPolicy | None = None,
+        pool: str = "default",
+        coalesce: bool = True,
     ) -> dict[str, Any] | list[Any] | Any:
         """Get the response asynchronously from a specified URL
 
+        GET responses are kept in the on-disk HTTP cache: fresh entries are
+        served without a request and stale ones are revalidated with
+        `If-None-Match`/`If-Modified-Since`. Requests that reach the network,
+        retries included, are throttled per host by the `rate_limits` token
+        buckets. Connection errors, timeouts and transient statuses (429, 5xx)
+        are retried for idempotent methods according to the retry policy.
+        Each upstream host has a circuit breaker: while it is open, calls fail
+        immediately with `CircuitOpenError` instead of waiting for timeouts.
+
+        Concurrent identical GET requests (same pool, URL, params and headers)
+        share one upstream call and its decoded result, which callers must
+        not mutate.
+
         Args:
             url (str): The API URL.
             method (HTTPMethod): HTTP method.
             headers (dict): Request headers including authorization.
             params (dict, optional): Query parameters. Defaults to dict empty.
             data (dict, optional): JSON payload for POST requests. Defaults to dict empty.
+            cache (bool, optional): Use the HTTP cache for GET requests. Defaults to True.
+            retry_policy (RetryPolicy, optional): Overrides the client's default retry policy.
+            pool (str, optional): Connection pool profile to use. Defaults to "default".
+            coalesce (bool, optional): Share in-flight identical GET requests. Defaults to True.
 
         Raises:
             FailedExternalAPI: If API call fails.
+            CircuitOpenError: If the circuit breaker of the upstream host is open.
 
         Returns:
             dict: The response data.
@@ -176,42 +297,325 @@ class HTTPClient(metaclass=SingletonMeta):
 
         if data is None:
             data = {}
+        policy = retry_policy or self._retry_policy
+        http_cache = (
+            self.get_http_cache() if cache and method == HTTPMethod.GET else None
+        )
+
+        if coalesce and method == HTTPMethod.GET:
+            key = (
+                pool,
+                url,
+                tuple(sorted(params.items())),
+                tuple(sorted((headers or {}).items())),
+                http_cache is not None,
+            )
+            return await self._singleflight.do(
+                key,
+                lambda: self._send_async(
+                    url, headers, params, data, method, http_cache, policy, pool
+                ),
+            )
+        return await self._send_async(
+            url, headers, params, data, method, http_cache, policy, pool
+        )
 
-        session = await self.get_aiohttp_session()
-        for attempt in range(1, self._max_retries + 1):
+    async def _send_async(
+        self,
+        url: str,
+        headers: dict[str, str] | None,
+        params: dict[str, str],
+        data: dict[str, Any],
+        method: HTTPMethod,
+        http_cache: HTTPCache | None,
+        policy: RetryPolicy,
+        pool: str,
+    ) -> dict[str, Any] | list[Any] | Any:
+        """Send a request with retries and return its decoded response."""
+        attempts = policy.attempts_for(method.value)
+        session = await self.get_aiohttp_session(pool)
+        for attempt in range(1, attempts + 1):
             try:
-                if method == HTTPMethod.GET:
-                    async with session.get(
-                        url, headers=headers, params=params
-                    ) as response:
-                        response_data = await response.json()
-                elif method == HTTPMethod.POST:
-                    async with session.post(
-                        url, headers=headers, params=params, json=data
-                    ) as response:
-                        response_data = await response.json()
-                elif method == HTTPMethod.PUT:
-                    async with session.put(
-                        url, headers=headers, params=params, json=data
-                    ) as response:
-                        response_data = await response.json()
-                elif method == HTTPMethod.DELETE:
-                    async with session.delete(
-                        url, headers=headers, params=params
-                    ) as response:
-                        response_data = await response.json()
-
-                self._handle_response_error(response.status, url, response_data)
-                return response_data
-
-            except ClientError as e:
+                status, response_headers, response_data = await self._request_async(
+                    session, method, url, headers, params, data, http_cache
+                )
+            except (ClientError, asyncio.TimeoutError) as e:
                 logger.error(
-                    f"[Attempt {attempt}] Async HTTP request to {url} failed: {e}"
+                    f"[Attempt {attempt}/{attempts}] Async HTTP request to {url} failed: {e!r}"
                 )
-                if attempt >= self._max_retries:
+                if attempt >= attempts:
                     raise FailedExternalAPI(
-                        f"Async HTTP request to {url} failed after {self._max_retries} retries: {e}"
+                        f"Async HTTP request to {url} failed after {attempts} attempts: {e!r}"
                     )
+                self._metrics.retry(url, method.value, type(e).__name__)
+                await asyncio.sleep(policy.delay(attempt))
+                continue
+
+            if attempt < attempts and policy.should_retry_status(status):
+                delay = policy.delay(attempt, response_headers.get("Retry-After"))
+                logger.warning(
+                    f"[Attempt {attempt}/{attempts}] Status {status} from {url}, retrying in {delay:.2f}s"
+                )
+                self._metrics.retry(url, method.value, str(status))
+                await asyncio.sleep(delay)
+                continue
+
+            self._handle_response_error(status, url, response_data)
+            return response_data
+
+    async def _request_async(
+        self,
+        session: ClientSession,
+        method: HTTPMethod,
+        url: str,
+        headers: dict[str, str] | None,
+        params: dict[str, str],
+        data: dict[str, Any],
+        http_cache: HTTPCache | None,
+    ) -> tuple[int, Mapping[str, str], Any]:
+        """Send one request, going through the HTTP cache when one is given."""
+        key: str | None = None
+        cached: tuple[CacheEntry, bytes] | None = None
+        request_headers = dict(headers or {})
+        if http_cache is not None:
+            key = http_cache.key(url, params)
+            cached = await http_cache.get(key)
+            if cached is not None:
+                entry, body = cached
+                if entry.is_fresh():
+                    logger.debug(f"HTTP cache hit for {url}")
+                    return 200, {}, self._decode_json(url, body)
+                request_headers.update(entry.validators())
+
+        # Check the breaker first so an open circuit fails without waiting for
+        # a rate limit token.
+        breaker = self._circuit_breakers.get(url) if self._circuit_breakers else None
+        admitted_in = breaker.acquire() if breaker else None
+        success: bool | None = None
+        try:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(url)
+            with self._metrics.request(url, method.value) as measurement:
+                async with session.request(
+                    method.value,
+                    url,
+                    headers=request_headers,
+                    params=params,
+                    json=data if method in (HTTPMethod.POST, HTTPMethod.PUT) else None,
+                ) as response:
+                    status = response.status
+                    response_headers = response.headers
+                    body = await response.read()
+                measurement.status_code = status
+                measurement.body_size = len(body)
+            success = status < 500
+        except (ClientError, asyncio.TimeoutError):
+            success = False
+            raise
+        finally:
+            if breaker is not None and admitted_in is not None:
+                breaker.record(admitted_in, success)
+
+        if http_cache is not None and key is not None:
+            if status == 304 and cached is not None:
+                logger.debug(f"HTTP cache revalidated for {url}")
+                await http_cache.refresh(key, cached[0], response_headers)
+                return 200, response_headers, self._decode_json(url, cached[1])
+            if status == 200:
+                response_data = self._decode_json(url, body)
+                await http_cache.put(key, url, body, response_headers)
+                return status, response_headers, response_data
+        return status, response_headers, self._parse_body(url, status, body)
+
+    @staticmethod
+    def _encode_body(method: HTTPMethod, data: dict[str, Any]) -> dict[str, Any]:
+        """Keyword arguments sending `data` as a JSON body with `requests`."""
+        if method not in (HTTPMethod.POST, HTTPMethod.PUT):
+            return {}
+        return {
+            "data": json_codec.dumps(data),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    @classmethod
+    def _parse_body(cls, url: str, status: int, body: bytes) -> Any:
+        """Decode a JSON body. Error bodies that are not JSON are returned as text."""
+        if 200 <= status < 300:
+            return cls._decode_json(url, body)
+        try:
+            return json_codec.loads(body)
+        except ValueError:
+            return body.decode(errors="replace")
+
+    @staticmethod
+    def _decode_json(url: str, body: bytes) -> Any:
+        try:
+            return json_codec.loads(body)
+        except ValueError:
+            raise FailedExternalAPI(f"Invalid JSON response from {url}")
+
+    async def stream_json_items_async(
+        self,
+        url: str,
+        item_key: str,
+        predicate: Callable[[Any], bool] | None = None,
+        headers: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None,
+        pool: str = "default",
+        cache: bool = True,
+    ) -> AsyncIterator[Any]:
+        """Stream the items of a JSON array from a GET response without loading the whole body
+
+        Responses go through the on-disk HTTP cache like `get_response_async`:
+        fresh entries are streamed from disk without a request, and stale ones
+        are revalidated with `If-None-Match`/`If-Modified-Since`, streaming the
+        stored body from disk on a 304. A 200 body is written to the cache as it
+        is streamed and stored once read to the end, so memory use does not
+        grow with the size of the body.
+
+        Args:
+            url (str): The API URL.
+            item_key (str): Top-level key holding the array, e.g. "data".
+            predicate (Callable, optional): Only items for which it returns True are yielded.
+            headers (dict, optional): Request headers including authorization.
+            params (dict, optional): Query parameters. Defaults to dict empty.
+            pool (str, optional): Connection pool profile to use. Defaults to "default".
+            cache (bool, optional): Use the HTTP cache. Defaults to True.
+
+        Raises:
+            FailedExternalAPI: If API call fails or the body cannot be parsed.
+
+        Yields:
+            Any: The matching array items, in document order.
+        """
+        params = self._normalize_params(params or {})
+        http_cache = self.get_http_cache() if cache else None
+        key: str | None = None
+        entry: CacheEntry | None = None
+        request_headers = dict(headers or {})
+        if http_cache is not None:
+            key = http_cache.key(url, params)
+            entry = await http_cache.get_entry(key)
+            if entry is not None:
+                if entry.is_fresh():
+                    logger.debug(f"HTTP cache hit for {url}")
+                    async for item in self._iter_cached_items(
+                        http_cache, key, url, item_key, predicate
+                    ):
+                        yield item
+                    return
+                request_headers.update(entry.validators())
+
+        session = await self.get_aiohttp_session(pool)
+        # Check the breaker first so an open circuit fails without waiting for
+        # a rate limit token.
+        breaker = self._circuit_breakers.get(url) if self._circuit_breakers else None
+        admitted_in = breaker.acquire() if breaker else None
+        success: bool | None = None
+        revalidated = False
+        try:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(url)
+            with self._metrics.request(url, HTTPMethod.GET.value) as measurement:
+                async with session.get(
+                    url, headers=request_headers, params=params
+                ) as response:
+                    success = response.status < 500
+                    measurement.status_code = response.status
+                    if (
+                        response.status == 304
+                        and http_cache is not None
+                        and key is not None
+                        and entry is not None
+                    ):
+                        logger.debug(f"HTTP cache revalidated for {url}")
+                        await http_cache.refresh(key, entry, response.headers)
+                        revalidated = True
+                    else:
+                        if response.status >= 300:
+                            self._handle_response_error(
+                                response.status, url, await response.text()
+                            )
+                        writer = (
+                            await http_cache.open_writer(key, url)
+                            if http_cache is not None
+                            and key is not None
+                            and response.status == 200
+                            else None
+                        )
+                        try:
+                            chunks = self._measure_chunks(
+                                response.content.iter_chunked(self._stream_chunk_size),
+                                measurement,
+                                writer,
+                            )
+                            async for item in iter_json_array(chunks, item_key):
+                                if predicate is None or predicate(item):
+                                    yield item
+                            if writer is not None:
+                                # Read the rest to store it whole.
+                                async for _ in chunks:
+                                    pass
+                                await writer.commit(response.headers)
+                        finally:
+                            if writer is not None:
+                                await writer.discard()
+        except (ClientError, asyncio.TimeoutError) as e:
+            success = False
+            logger.error(f"Streaming HTTP request to {url} failed: {e!r}")
+            raise FailedExternalAPI(f"Streaming HTTP request to {url} failed: {e!r}")
+        except ValueError as e:
+            logger.error(f"Invalid JSON stream from {url}: {e}")
+            raise FailedExternalAPI(f"Invalid JSON stream from {url}: {e}")
+        finally:
+            if breaker is not None and admitted_in is not None:
+                breaker.record(admitted_in, success)
+
+        if revalidated and http_cache is not None and key is not None:
+            async for item in self._iter_cached_items(
+                http_cache, key, url, item_key, predicate
+            ):
+                yield item
+
+    async def _iter_cached_items(
+        self,
+        http_cache: HTTPCache,
+        key: str,
+        url: str,
+        item_key: str,
+        predicate: Callable[[Any], bool] | None,
+    ) -> AsyncIterator[Any]:
+        """Stream the items of a JSON array from a body stored in the HTTP cache."""
+        try:
+            async for item in iter_json_array(
+                http_cache.iter_body(key, self._stream_chunk_size), item_key
+            ):
+                if predicate is None or predicate(item):
+                    yield item
+        except OSError as e:
+            logger.error(f"Cached body for {url} is no longer readable: {e}")
+            raise FailedExternalAPI(f"Cached body for {url} is no longer readable: {e}")
+        except ValueError as e:
+            logger.error(f"Invalid cached JSON body for {url}: {e}")
+            raise FailedExternalAPI(f"Invalid cached JSON body for {url}: {e}")
+
+    @staticmethod
+    async def _measure_chunks(
+        chunks: AsyncIterator[bytes],
+        measurement: RequestMeasurement,
+        writer: CacheWriter | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Pass `chunks` through, keeping their total size in `measurement.body_size`.
+
+        The chunks are also written to `writer` when one is given.
+        """
+        size = 0
+        async for chunk in chunks:
+            size += len(chunk)
+            measurement.body_size = size
+            if writer is not None:
+                await writer.write(chunk)
+            yield chunk
 
     @staticmethod
     def _normalize_params(params: dict[str, Any]) -> dict[str, str]:
@@ -230,7 +634,7 @@ class HTTPClient(metaclass=SingletonMeta):
             elif isinstance(v, bool):
                 result[k] = str(v).lower()
             elif isinstance(v, (dict, list)):
-                result[k] = ujson.dumps(v)
+                result[k] = json_codec.dumps_str(v)
             else:
                 result[k] = str(v)
 
@@ -0,0 +1,90 @@
+import codecs
+import json
+import re
+from collections.abc import AsyncIterator
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+_ITEM_END = _WHITESPACE + ",]"
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes], key: str
+) -> AsyncIterator[Any]:
+    """Incrementally decode the items of the array stored under `key`.
+
+    Only the current chunk and the item being decoded are kept in memory, so
+    the size of the whole document does not matter. The array must appear
+    under a top-level key, e.g. `{"status": "success", "data": [...]}`.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Raw UTF-8 body chunks.
+        key (str): Name of the key holding the array.
+
+    Raises:
+        ValueError: If the array is not found or the body is not valid JSON.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buffer = ""
+    pos = 0  # start of the unread part of `buffer`
+    eof = False
+    in_array = False
+
+    async def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            eof = True
+            text = utf8.decode(b"", final=True)
+        else:
+            text = utf8.decode(chunk)
+        # The consumed part is dropped here, once per chunk, not after each item.
+        buffer = buffer[pos:] + text
+        pos = 0
+        return not eof
+
+    while True:
+        if not in_array:
+            match = array_start.search(buffer, pos)
+            if match:
+                pos = match.end()
+                in_array = True
+                continue
+            # Keep a tail in case the key is split across two chunks.
+            pos = max(pos, len(buffer) - (len(key) + 64))
+            if not await read_more():
+                raise ValueError(f"No array found under key '{key}'")
+            continue
+
+        while pos < len(buffer) and (buffer[pos] in _WHITESPACE or buffer[pos] == ","):
+            pos += 1
+        if pos == len(buffer):
+            if not await read_more():
+                raise ValueError(f"Unterminated array under key '{key}'")
+            continue
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            item, end = None, -1
+        # An item may be truncated if it ends at the buffer edge, and a number
+        # may also stop early inside the buffer, e.g. "2." waiting for "5".
+        complete = end != -1 and (
+            end == len(buffer) or buffer[end] in _ITEM_END or not _is_number(item)
+        )
+        if not eof and (not complete or end == len(buffer)):
+            _ = await read_more()
+            continue
+        if not complete:
+            raise ValueError(f"Invalid JSON item under key '{key}'")
+        pos = end
+        yield item
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import MetricReader
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+
+from configs import MetricsConfig, get_logger
+
+logger = get_logger("metrics")
+
+_metrics_configured = False
+
+
+def setup_metrics(config: MetricsConfig) -> None:
+    """Install the global meter provider with the exporter selected in `config`.
+
+    Only the first call has an effect. With `exporter: none` no provider is
+    installed and all instruments are no-ops.
+    """
+    global _metrics_configured
+    if _metrics_configured or config.exporter == "none":
+        return
+    _metrics_configured = True
+
+    reader: MetricReader
+    if config.exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
+            OTLPMetricExporter,
+        )
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+        reader = PeriodicExportingMetricReader(
+            OTLPMetricExporter(endpoint=config.otlp_endpoint),
+            export_interval_millis=config.export_interval_seconds * 1000,
+        )
+    else:
+        from opentelemetry.exporter.prometheus import PrometheusMetricReader
+        from prometheus_client import start_http_server
+
+        reader = PrometheusMetricReader()
+        _ = start_http_server(config.prometheus_port, addr=config.prometheus_host)
+
+    metrics.set_meter_provider(
+        MeterProvider(
+            resource=Resource.create({SERVICE_NAME: "data-updating"}),
+            metric_readers=[reader],
+        )
+    )
+    logger.info(f"Exporting metrics with {config.exporter}")
+
+
+@dataclass
+class RequestMeasurement:
+    """Outcome of one HTTP request, filled in by the caller of `HTTPMetrics.request`."""
+
+    status_code: int | None = None
+    body_size: int | None = None  # bytes
+
+
+class HTTPMetrics:
+    """OpenTelemetry instruments of HTTPClient.
+
+    Measurements carry the upstream `server.address`/`server.port`, the
+    `http.request.method` and, once known, the `http.response.status_code` or
+    the `error.type` of a failed request.
+    """
+
+    def __init__(self):
+        meter = metrics.get_meter("data-updating.http_client")
+        self.duration = meter.create_histogram(
+            "http.client.request.duration",
+            unit="s",
+            description="Duration of HTTP requests, from sending to reading the body.",
+        )
+        self.body_size = meter.create_histogram(
+            "http.client.response.body.size",
+            unit="By",
+            description="Size of HTTP response bodies.",
+        )
+        self.active_requests = meter.create_up_down_counter(
+            "http.client.active_requests",
+            unit="{request}",
+            description="Number of HTTP requests in flight.",
+        )
+        self.retries = meter.create_counter(
+            "http.client.retries",
+            unit="{retry}",
+            description="Number of HTTP requests retried, by reason.",
+        )
+
+    @staticmethod
+    def _attributes(url: str, method: str) -> dict[str, str | int]:
+        parts = urlsplit(url)
+        attributes: dict[str, str | int] = {
+            "server.address": parts.hostname or "",
+            "http.request.method": method,
+        }
+        if parts.port is not None:
+            attributes["server.port"] = parts.port
+        return attributes
+
+    @contextmanager
+    def request(self, url: str, method: str) -> Iterator[RequestMeasurement]:
+        """Measure one request; set the status and body size on the yielded object."""
+        attributes = self._attributes(url, method)
+        measurement = RequestMeasurement()
+        error_type: str | None = None
+        self.active_requests.add(1, attributes)
+        start = time.perf_counter()
+        try:
+            yield measurement
+        except BaseException as e:
+            error_type = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.active_requests.add(-1, attributes)
+            outcome = dict(attributes)
+            if measurement.status_code is not None:
+                outcome["http.response.status_code"] = measurement.status_code
+                if measurement.status_code >= 500:
+                    error_type = error_type or str(measurement.status_code)
+            if error_type is not None:
+                outcome["error.type"] = error_type
+            self.duration.record(elapsed, outcome)
+            if measurement.body_size is not None:
+                self.body_size.record(measurement.body_size, outcome)
+
+    def retry(self, url: str, method: str, reason: str) -> None:
+        """Count a retry; `reason` is the status code or the exception type."""
+        attributes = self._attributes(url, method)
+        attributes["retry.reason"] = reason
+        self.retries.add(1, attributes)
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from configs import RateLimit
+
+
+class TokenBucket:
+    """Async token bucket refilled at `rate` tokens per second, holding at most `capacity`.
+
+    Callers reserve a token without holding a lock across awaits: when the bucket
+    is empty the balance goes negative and each caller sleeps until its own token
+    has been refilled, so waiters are served in arrival order.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (int): Maximum number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate: float = rate
+        self.capacity: int = capacity
+        self._tokens: float = float(capacity)
+        self._updated_at: float = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    """Limit the rate of requests started to each host with one token bucket per host.
+
+    Hosts are matched on the `host[:port]` part of the URL.
+
+    Args:
+        limits (dict[str, RateLimit]): Rate limit of specific hosts.
+        default (RateLimit, optional): Rate limit of the other hosts. They are not
+            limited when omitted.
+    """
+
+    def __init__(
+        self, limits: dict[str, RateLimit], default: RateLimit | None = None
+    ):
+        self.limits: dict[str, RateLimit] = limits
+        self.default: RateLimit | None = default
+        self._buckets: dict[str, TokenBucket | None] = {}
+
+    def _bucket(self, host: str) -> TokenBucket | None:
+        if host not in self._buckets:
+            limit = self.limits.get(host, self.default)
+            self._buckets[host] = (
+                TokenBucket(limit.requests_per_second, limit.burst) if limit else None
+            )
+        return self._buckets[host]
+
+    async def acquire(self, url: str) -> None:
+        """Wait until a request to the host of `url` may be started."""
+        bucket = self._bucket(urlsplit(url).netloc)
+        if bucket is not None:
+            await bucket.acquire()
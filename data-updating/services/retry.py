@@ -0,0 +1,60 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from pydantic import BaseModel
+
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})
+TRANSIENT_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy(BaseModel):
+    """When and how long to wait before retrying an HTTP request.
+
+    The n-th retry waits a random delay in `[0, min(max_delay, base_delay * 2**(n-1))]`
+    (exponential backoff with full jitter), or the server's Retry-After when
+    one is sent, capped at `max_delay`.
+    """
+
+    max_attempts: int = 4  # including the first attempt
+    base_delay: float = 0.5  # seconds
+    max_delay: float = 30.0  # seconds
+    retry_methods: frozenset[str] = IDEMPOTENT_METHODS
+    retry_statuses: frozenset[int] = TRANSIENT_STATUSES
+    respect_retry_after: bool = True
+
+    def attempts_for(self, method: str) -> int:
+        return self.max_attempts if method.upper() in self.retry_methods else 1
+
+    def should_retry_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Delay after the failed `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        if self.respect_retry_after:
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                return min(self.max_delay, server_delay)
+        return self.backoff(attempt)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,37 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers asking for the same key.
+
+    The first caller for a key starts the call in a task; callers arriving
+    while it runs await the same task and get the same result or exception.
+    The key is released as soon as the call completes, so later callers start
+    a new one. Results are shared, not copied, and must be treated as read-only.
+
+    Cancelling a caller does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+        self.coalesced: int = 0  # callers served by another caller's call
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._release(key, task))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so it is not reported as never retrieved
+        # when every caller has been cancelled.
+        if not task.cancelled():
+            _ = task.exception()
@@ -1,3 +1,4 @@
 from .hasher import HashFunction
 
 hasher = HashFunction()
+fingerprinter = HashFunction("sha256")
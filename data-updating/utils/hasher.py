@@ -1,5 +1,7 @@
 import hashlib
+import json
 import uuid
+from typing import Any
 
 
 class HashFunction:
@@ -8,6 +10,7 @@ class HashFunction:
 
     Methods:
         get_hash(): Compute and return the hash of the input data as a hexadecimal string.
+        get_fingerprint(): Compute a content fingerprint of JSON-serializable data.
     """
 
     def __init__(self, algorithm: str = "uuid5"):
@@ -29,3 +32,16 @@ class HashFunction:
             return uuid.uuid5(uuid.NAMESPACE_URL, data)
         else:
             raise NotImplementedError("Unsupported hash algorithm")
+
+    def get_fingerprint(self, data: Any) -> str:
+        """Compute a hex digest of `data` that only depends on its content.
+
+        `data` is serialized as canonical JSON (sorted keys, no whitespace), so
+        equal dicts give equal fingerprints regardless of key order.
+        """
+        if self.algorithm == "uuid5":
+            raise NotImplementedError("Fingerprints require a hashlib algorithm")
+        canonical = json.dumps(
+            data, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.new(self.algorithm, canonical.encode()).hexdigest()
@@ -19,6 +19,7 @@ from langchain_core.prompts import MessagesPlaceholder
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from prompts.orchestrator import ORCHESTRATOR_SYSTEM_PROMPT
 from pydantic import BaseModel, Field
+from utils import json_codec
 from utils.singleton_base import SingletonBase
 
 logging.basicConfig(
@@ -255,7 +256,7 @@ class OrchestratorAgent(SingletonBase):
         if policy:
             payload["policy"] = policy
 
-        return "Here is the pools data : \n" + json.dumps(payload, ensure_ascii=True)
+        return "Here is the pools data : \n" + json_codec.dumps_str(payload)
 
 
 # =========================
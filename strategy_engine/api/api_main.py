@@ -8,7 +8,9 @@ from api.errors import BadAIResponse
 from api.models import SupportedTokens
 from database.mongodb import MongoDB
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.status import HTTP_200_OK
+from utils import json_codec
 from utils.models import RiskLabel
 
 API_PREFIX = "/api/v1"
@@ -32,7 +34,13 @@ async def lifespan(app: FastAPI):  # pyright: ignore[reportUnusedParameter]
         logger.info("Closed connection")
 
 
-app = FastAPI(root_path=API_PREFIX, lifespan=lifespan)
+app = FastAPI(
+    root_path=API_PREFIX,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+    if json_codec.BACKEND == "orjson"
+    else JSONResponse,
+)
 
 
 @app.get("/health")
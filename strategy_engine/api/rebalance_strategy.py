@@ -4,6 +4,7 @@ from typing import Any
 from agents.models import FinalStrategy
 from agents.orchestrator import OrchestratorAgent
 from api.models import SupportedTokens
+from api.strategy_cache import StrategyKey, strategy_cache
 from database.mongodb import MongoDB
 from utils.models import RiskLabel
 
@@ -17,9 +18,6 @@ async def rebalance_strategy(
     risk: RiskLabel = RiskLabel.BALANCED,
 ) -> FinalStrategy:
     mongo = MongoDB()
-    orchestrator = OrchestratorAgent()
-    await orchestrator.initialize()
-
     pools = await mongo.get_latest_pools_by_symbol(token)
 
     logger.info(
@@ -31,8 +29,15 @@ async def rebalance_strategy(
             pool[key] = str(value) if value is not None else value
 
     logger.info(f"Total pools from DB: {len(pools_data)}")
-    return await orchestrator.execute_strategy(
-        pools_data=pools_data,
-        policy=policy,
-        risk=risk,
-    )
+
+    async def run_agents() -> FinalStrategy:
+        orchestrator = OrchestratorAgent()
+        await orchestrator.initialize()
+        return await orchestrator.execute_strategy(
+            pools_data=pools_data,
+            policy=policy,
+            risk=risk,
+        )
+
+    key = StrategyKey.build(token.value, risk.value, policy, pools_data)
+    return await strategy_cache.get_or_compute(key, run_agents)
@@ -0,0 +1,144 @@
+"""In-process cache of rebalance strategies.
+
+A strategy only depends on the token, the risk label, the policy and the pool
+data given to the agents, so vaults sharing them are served one debate. The
+pool data is identified by a hash of the exact payload sent to the agents: when
+new pool snapshots land, the data version of the token changes and every
+strategy cached for it is dropped.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from agents.models import FinalStrategy
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 128
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_policy(policy: str | dict[str, Any] | None) -> str:
+    """Canonical text of a policy.
+
+    Text policies have their whitespace collapsed, dict policies are dumped with
+    sorted keys, and a missing or empty policy normalizes to "".
+    """
+    if not policy:
+        return ""
+    if isinstance(policy, dict):
+        return json.dumps(
+            policy, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+    return " ".join(policy.split())
+
+
+@dataclass(frozen=True)
+class StrategyKey:
+    token: str
+    risk_label: str
+    policy_hash: str  # sha256 of the normalized policy
+    data_version: str  # sha256 of the pool data given to the agents
+
+    @classmethod
+    def build(
+        cls,
+        token: str,
+        risk_label: str,
+        policy: str | dict[str, Any] | None,
+        pools_data: list[dict[Any, Any]],
+    ) -> "StrategyKey":
+        return cls(
+            token=token,
+            risk_label=risk_label,
+            policy_hash=_sha256(normalize_policy(policy).encode()),
+            data_version=_sha256(json_codec.dumps(pools_data)),
+        )
+
+
+class StrategyCache:
+    """LRU cache of `FinalStrategy` by `StrategyKey`, with in-flight coalescing.
+
+    Concurrent requests for the same key share one computation, which keeps
+    running if its callers disconnect. Failed computations are not cached.
+    Cached strategies are shared between callers and must not be mutated.
+
+    Args:
+        max_entries (int): Number of strategies kept. Defaults to MAX_ENTRIES.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[StrategyKey, FinalStrategy] = OrderedDict()
+        self._data_versions: dict[str, str] = {}  # latest data version per token
+        self._in_flight: dict[StrategyKey, asyncio.Task[FinalStrategy]] = {}
+        self.hits: int = 0  # served from the cache or from a call in flight
+        self.misses: int = 0
+
+    async def get_or_compute(
+        self, key: StrategyKey, compute: Callable[[], Awaitable[FinalStrategy]]
+    ) -> FinalStrategy:
+        """Return the strategy cached for `key`, or compute and cache it."""
+        self._set_data_version(key.token, key.data_version)
+        strategy = self._entries.get(key)
+        if strategy is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            logger.info(f"Strategy cache hit for {key.token}/{key.risk_label}")
+            return strategy
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, compute))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._release(key, task))
+        else:
+            self.hits += 1
+            logger.info(f"Strategy for {key.token}/{key.risk_label} already running")
+        return await asyncio.shield(task)
+
+    def invalidate(self, token: str | None = None) -> None:
+        """Drop the strategies cached for `token`, or all of them."""
+        for key in [k for k in self._entries if token is None or k.token == token]:
+            del self._entries[key]
+
+    async def _compute(
+        self, key: StrategyKey, compute: Callable[[], Awaitable[FinalStrategy]]
+    ) -> FinalStrategy:
+        strategy = await compute()
+        # Do not cache strategies computed from pool data replaced meanwhile.
+        if self._data_versions.get(key.token) == key.data_version:
+            self._entries[key] = strategy
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+        return strategy
+
+    def _set_data_version(self, token: str, data_version: str) -> None:
+        if self._data_versions.get(token) == data_version:
+            return
+        if token in self._data_versions:
+            logger.info(f"Pool data of {token} changed, dropping cached strategies")
+            self.invalidate(token)
+        self._data_versions[token] = data_version
+
+    def _release(self, key: StrategyKey, task: asyncio.Task[FinalStrategy]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so it is not reported as never retrieved
+        # when every caller has disconnected.
+        if not task.cancelled():
+            _ = task.exception()
+
+
+strategy_cache = StrategyCache()
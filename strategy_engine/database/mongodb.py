@@ -4,9 +4,11 @@ from typing import Any
 
 from api.models import SupportedTokens
 from beanie import init_beanie
+from beanie.operators import In
 from config.settings import databases_config
 from database.models import (
     AgentMessages,
+    PoolsLatest,
     PoolsMetdadata,
     PoolSnapshot,
     PoolSnapshotMinimal,
@@ -33,7 +35,12 @@ class MongoDB(SingletonBase):
     async def init(self):
         await init_beanie(
             database=self.db,
-            document_models=[PoolSnapshot, PoolsMetdadata, AgentMessages],
+            document_models=[
+                PoolSnapshot,
+                PoolsLatest,
+                PoolsMetdadata,
+                AgentMessages,
+            ],
         )
 
     async def get_all_pools(self) -> list[PoolSnapshot]:
@@ -49,13 +56,11 @@ class MongoDB(SingletonBase):
             .to_list()
         )
 
-    async def get_latest_pool_by_name(self, pool_name: str) -> PoolSnapshot | None:
-        return (
-            await PoolSnapshot.find(PoolSnapshot.pool_name == pool_name)
-            .sort(
-                (PoolSnapshot.update_at, DESCENDING)  # pyright: ignore[reportArgumentType]
-            )
-            .first_or_none()
+    async def get_latest_pool_by_name(
+        self, pool_name: str
+    ) -> PoolSnapshotMinimal | None:
+        return await PoolsLatest.find_one(
+            PoolsLatest.pool_name == pool_name, projection_model=PoolSnapshotMinimal
         )
 
     async def _get_pools_name_by_symbol(self, symbol: SupportedTokens) -> list[str]:
@@ -70,19 +75,15 @@ class MongoDB(SingletonBase):
         self, symbol: SupportedTokens
     ) -> list[PoolSnapshotMinimal]:
         pool_names = await self._get_pools_name_by_symbol(symbol)
-        tasks = [self.get_latest_pool_by_name(name) for name in pool_names]
+        pools = await PoolsLatest.find(
+            In(PoolsLatest.pool_name, pool_names),
+            projection_model=PoolSnapshotMinimal,
+        ).to_list()
+        pools_by_name = {p.pool_name: p for p in pools}
 
-        results = await asyncio.gather(*tasks)
+        results = [pools_by_name.get(name) for name in pool_names]
         filtered_results = [
-            PoolSnapshotMinimal(
-                pool_name=r.pool_name,
-                apy_statistics=r.apy_statistics,
-                apyPct1D=r.apyPct1D,
-                apyPct7D=r.apyPct7D,
-                apyPct30D=r.apyPct30D,
-                tvlUsd=r.tvlUsd,
-                apy=r.apy,
-            )
+            r
             for r in results
             if r is not None
             and r.apy is not None
@@ -0,0 +1,67 @@
+"""JSON encoding and decoding backed by orjson, with a standard library fallback.
+
+Both backends produce compact UTF-8 JSON and serialize `datetime`, `date` and
+`UUID` values the same way, so callers do not depend on which one is installed.
+"""
+
+import json
+from collections.abc import Callable
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# `orjson.JSONDecodeError` subclasses `json.JSONDecodeError`.
+JSONDecodeError = json.JSONDecodeError
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Serialize `obj` to compact UTF-8 JSON bytes.
+
+    Args:
+        obj (Any): The value to serialize.
+        default (Callable, optional): Called for values the backend cannot serialize.
+
+    Raises:
+        TypeError: If a value cannot be serialized.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(
+        obj,
+        default=default or _default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def dumps_str(obj: Any, default: Callable[[Any], Any] | None = None) -> str:
+    """Serialize `obj` to a compact JSON string."""
+    return dumps(obj, default=default).decode()
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Deserialize JSON from bytes or a string.
+
+    Raises:
+        JSONDecodeError: If `data` is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -2,8 +2,10 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from clients import Clients
+from services import json_codec
 
 from .router import strategy, transaction, user, vault
 
@@ -21,6 +23,9 @@ app = FastAPI(
     title="Vault Management API",
     description="API for managing and interacting with vaults.",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse
+    if json_codec.BACKEND == "orjson"
+    else JSONResponse,
 )
 
 app.include_router(vault.router)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 
-from backend.user import UserOperations, VaultData
+from backend.user import EarningsAccrual, UserOperations, VaultData
 from hooks.error import ResourceNotFound
 from hooks.success import SuccessResponse
 
@@ -68,20 +68,16 @@ async def get_user_balance_earnings(user_wallet: str, vault_name: str):
 
 
 @router.post("/balance/update_earnings", response_model=SuccessResponse)
-async def update_user_balance_earnings(
-    user_wallet: str, vault_name: str, time_interval: float = 6.0
-):
+async def update_user_balance_earnings(user_wallet: str, vault_name: str):
     r"""
-    Update a user's balance earnings for a given vault over a specified time interval.
+    Checkpoint the earnings a user's balance accrued in a given vault since its last checkpoint.
 
-    - Query/body: `user_wallet` (str), `vault_name` (str), `time_interval` (float) in hours.
+    - Query/body: `user_wallet` (str), `vault_name` (str).
     - Success: returns `SuccessResponse` (200) when earnings are updated successfully.
     - Errors: 404 if the user or vault is not found, 500 on other failures.
     """
     try:
-        await UserOperations.update_user_balance_earnings(
-            user_wallet, vault_name, time_interval
-        )
+        await UserOperations.update_user_balance_earnings(user_wallet, vault_name)
         return SuccessResponse(
             status_code=200, message="User earnings updated successfully."
         )
@@ -93,6 +89,27 @@ async def update_user_balance_earnings(
         )
 
 
+@router.post("/balance/accrue_earnings", response_model=EarningsAccrual)
+async def accrue_all_earnings(vault_name: str | None = None):
+    r"""
+    Checkpoint the earnings accrued by every user position, or by the positions of one vault, in one pass.
+
+    Balances and earnings are computed on read, so this only materializes them.
+
+    - Query/body: `vault_name` (str, optional).
+    - Success: returns `EarningsAccrual` with the number of positions checkpointed and the total accrued.
+    - Errors: 404 if `vault_name` is given and not found, 500 on other failures.
+    """
+    try:
+        return await UserOperations.accrue_all_earnings(vault_name)
+    except ResourceNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to accrue user earnings: {str(e)}"
+        )
+
+
 @router.get("/personal_vaults", response_model=dict[int, VaultData])
 async def get_all_personal_vaults_for_a_user(user_wallet: str):
     """
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+def accrue_earnings(balance: float, apy: float, hours: float) -> float:
+    """Simple interest earned by `balance` at `apy` over `hours`."""
+    return balance * (apy / 365 / 24) * hours
+
+
+def elapsed_hours(since: datetime, until: datetime) -> float:
+    """Hours from `since` to `until`, or 0.0 if `until` is not later."""
+    return max(0.0, (until - since).total_seconds() / 3600)
+
+
+def accrue_earnings_batch(
+    balances: ArrayLike, apys: ArrayLike, hours: ArrayLike
+) -> NDArray[np.float64]:
+    """Vectorized `accrue_earnings` over many positions.
+
+    The arguments are broadcast against each other, so `apys` or `hours` may be
+    scalars. Operations are applied in the same order as the scalar version, so
+    results are bit-for-bit identical to calling `accrue_earnings` per position.
+
+    Returns:
+        NDArray[np.float64]: The earnings of each position.
+    """
+    balances = np.asarray(balances, dtype=np.float64)
+    apys = np.asarray(apys, dtype=np.float64)
+    hours = np.asarray(hours, dtype=np.float64)
+    return balances * (apys / 365 / 24) * hours
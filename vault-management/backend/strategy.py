@@ -1,12 +1,14 @@
 from datetime import datetime
 from typing import Any
 
+from beanie.operators import In
+
 from clients import Clients
 from configs import get_logger
 from hooks.error import ResourceNotFound
 from llm.strategy_updated import get_strategy_changes
 from mongo.schemas import (
-    PoolsSnapshot,
+    PoolsLatest,
     StrategyInfo,
     UpdatedInfo,
     VaultsMetadata,
@@ -15,6 +17,8 @@ from mongo.schemas import (
 )
 from utils import hasher
 
+from .user import UserOperations
+
 logger = get_logger("strategy_operations")
 mongo_client = Clients.get_mongo_client()
 
@@ -41,18 +45,14 @@ class StrategyOperations:
         self.strategy_response: StrategyInfo = fix_strategy_allocations(strategy_info)
         self.vault_name: str = vault_name
 
-    async def get_chosen_pool_apy(self, pool_name: str) -> float:
-        pool = (
-            await PoolsSnapshot.find(PoolsSnapshot.pool_name == pool_name)
-            .sort(-PoolsSnapshot.update_at)
-            .first_or_none()
-        )
-        if pool:
-            last_snapshot = pool.pool_charts_30d[-1]
-            return last_snapshot.apy
-        else:
-            logger.warning(f"Pool with name {pool_name} not found.")
-            raise ResourceNotFound(f"Pool with name {pool_name} not found.")
+    async def get_chosen_pools_apy(self, pool_names: list[str]) -> dict[str, float]:
+        """Latest APY of each pool, read from `pools_latest` in one query."""
+        pools_latest = await PoolsLatest.find(
+            In(PoolsLatest.pool_name, pool_names)
+        ).to_list()
+        return {
+            pool.pool_name: pool.apy for pool in pools_latest if pool.apy is not None
+        }
 
     def get_vault_apy(self, pools_allocation: list[tuple[float, float]]) -> float:
         vault_apy = sum(apy * weight for apy, weight in pools_allocation)
@@ -64,18 +64,30 @@ class StrategyOperations:
         )
         if not vault:
             raise ResourceNotFound(f"Vault with name {self.vault_name} not found.")
+        allocations = self.strategy_response.strategy.allocations
+        pools_apy = await self.get_chosen_pools_apy(
+            [allocation.pool_name for allocation in allocations]
+        )
         pools_allocation: list[tuple[float, float]] = []
-        for allocation in self.strategy_response.strategy.allocations:
-            try:
-                pool_apy = await self.get_chosen_pool_apy(allocation.pool_name)
-                pools_allocation.append((pool_apy, allocation.weight_pct / 100))
-            except ResourceNotFound as e:
-                logger.error(f"Error getting APY for pool {allocation.pool_name}: {e}")
+        for allocation in allocations:
+            if allocation.pool_name not in pools_apy:
+                logger.error(
+                    f"Error getting APY for pool {allocation.pool_name}: Pool with name {allocation.pool_name} not found."
+                )
                 raise ResourceNotFound(
-                    f"Error getting APY for pool {allocation.pool_name}: {e}"
+                    f"Error getting APY for pool {allocation.pool_name}: Pool with name {allocation.pool_name} not found."
                 )
+            pools_allocation.append(
+                (pools_apy[allocation.pool_name], allocation.weight_pct / 100)
+            )
         vault_apy = self.get_vault_apy(pools_allocation)
-        update_time = datetime.utcnow().isoformat()
+        update_at = datetime.utcnow()
+        update_time = update_at.isoformat()
+        # Checkpoint positions so earnings so far accrue at the previous APY
+        if vault_apy != await UserOperations.get_latest_vault_apy(vault.id):
+            _ = await UserOperations.checkpoint_positions(
+                vault.id, new_apys={vault.id: vault_apy}, checkpoint_at=update_at
+            )
         # Save Strategy Data
         vault_data = VaultsStrategy(
             id=hasher.get_hash(f"{vault.id}-{update_time}"),
@@ -1,7 +1,5 @@
 from datetime import datetime
 
-from beanie.operators import And
-
 from configs import get_logger
 from hooks.error import ResourceNotFound
 from mongo.schemas import (
@@ -27,7 +25,8 @@ class TransactionOperations:
         user = await UserMetadata.find_one(UserMetadata.wallet_address == user_wallet)
         if not user:
             user = await UserOperations.create_user(user_wallet)
-        transaction_time = datetime.utcnow().isoformat()
+        transaction_at = datetime.utcnow()
+        transaction_time = transaction_at.isoformat()
         vault_history = (
             await VaultsHistory.find(VaultsHistory.vault.id == vault.id)
             .sort(-VaultsHistory.update_at)
@@ -43,23 +42,15 @@ class TransactionOperations:
         )
         _ = await new_vault_history.save()
 
-        # Update User Balance
-        user_balance = (
-            await UserBalanceHistory.find(
-                And(
-                    UserBalanceHistory.user.id == user.id,
-                    UserBalanceHistory.vault.id == vault.id,
-                )
-            )
-            .sort(-UserBalanceHistory.update_at)
-            .first_or_none()
-        )
+        # Checkpoint User Balance with the earnings accrued so far
+        user_balance = await UserOperations.get_balance_checkpoint(user.id, vault.id)
         remaining_balance = amount
         earnings = 0.0
         if user_balance:
             remaining_balance += user_balance.remaining_balance
-            earnings = user_balance.earnings
-        print(f"{remaining_balance}, {earnings}")
+            earnings = await UserOperations.get_current_earnings(
+                user_balance, vault.id, transaction_at
+            )
         new_user_balance = UserBalanceHistory(
             id=hasher.get_hash(f"{user.id}-{vault.id}-{transaction_time}-deposit"),
             user=user,
@@ -67,6 +58,7 @@ class TransactionOperations:
             remaining_balance=remaining_balance,
             earnings=earnings,
             update_at=transaction_time,
+            apy=await UserOperations.get_latest_vault_apy(vault.id),
         )
         _ = await new_user_balance.save()
 
@@ -93,7 +85,8 @@ class TransactionOperations:
         user = await UserMetadata.find_one(UserMetadata.wallet_address == user_wallet)
         if not user:
             raise ResourceNotFound(f"User with wallet {user_wallet} not found.")
-        transaction_time = datetime.utcnow().isoformat()
+        transaction_at = datetime.utcnow()
+        transaction_time = transaction_at.isoformat()
         vault_history = (
             await VaultsHistory.find(VaultsHistory.vault.id == vault.id)
             .sort(-VaultsHistory.update_at)
@@ -112,21 +105,16 @@ class TransactionOperations:
         )
         _ = await new_vault_history.save()
 
-        # Update User Balance
-        user_balance = (
-            await UserBalanceHistory.find(
-                And(
-                    UserBalanceHistory.user.id == user.id,
-                    UserBalanceHistory.vault.id == vault.id,
-                )
+        # Checkpoint User Balance with the earnings accrued so far
+        user_balance = await UserOperations.get_balance_checkpoint(user.id, vault.id)
+        earnings = (
+            await UserOperations.get_current_earnings(
+                user_balance, vault.id, transaction_at
             )
-            .sort(-UserBalanceHistory.update_at)
-            .first_or_none()
+            if user_balance
+            else 0.0
         )
-        if (
-            not user_balance
-            or user_balance.remaining_balance + user_balance.earnings < amount
-        ):
+        if not user_balance or user_balance.remaining_balance + earnings < amount:
             raise ResourceNotFound(
                 f"Insufficient balance for user {user_wallet} in vault {vault_name}."
             )
@@ -134,11 +122,10 @@ class TransactionOperations:
             id=hasher.get_hash(f"{user.id}-{vault.id}-{transaction_time}-withdraw"),
             user=user,
             vault=vault,
-            remaining_balance=user_balance.remaining_balance
-            + user_balance.earnings
-            - amount,
-            earnings=max(0.0, user_balance.earnings - amount),
+            remaining_balance=user_balance.remaining_balance + earnings - amount,
+            earnings=max(0.0, earnings - amount),
             update_at=transaction_time,
+            apy=await UserOperations.get_latest_vault_apy(vault.id),
         )
         _ = await new_user_balance.save()
 
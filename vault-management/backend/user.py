@@ -1,10 +1,16 @@
 from datetime import datetime
+from typing import Any
+from uuid import UUID
 
 from beanie.operators import And
+from bson import DBRef
 from pydantic import BaseModel
+from pymongo import InsertOne
 
+from backend.accrual import accrue_earnings, accrue_earnings_batch, elapsed_hours
 from configs import get_logger
 from hooks.error import ResourceNotFound
+from mongo.balances import get_latest_balances
 from mongo.schemas import (
     UserBalanceHistory,
     UserMetadata,
@@ -29,6 +35,12 @@ class VaultAPY(BaseModel):
     apy: float
 
 
+class EarningsAccrual(BaseModel):
+    positions: int  # positions checkpointed
+    skipped_positions: int  # positions of vaults without a strategy APY
+    total_earnings: float
+
+
 class UserOperations:
     @staticmethod
     async def create_user(wallet_address: str) -> UserMetadata:
@@ -62,100 +74,230 @@ class UserOperations:
         return latest_strategy.apy
 
     @staticmethod
-    async def get_user_balance_nav(user_wallet: str, vault_name: str) -> float:
-        user = await UserMetadata.find_one(UserMetadata.wallet_address == user_wallet)
-        if not user:
-            raise ResourceNotFound(f"User with wallet {user_wallet} not found.")
-        vault = await VaultsMetadata.find_one(VaultsMetadata.name == vault_name)
-        if not vault:
-            raise ResourceNotFound(f"Vault with name {vault_name} not found.")
-        user_balance = (
+    async def get_latest_vault_apy(vault_id: UUID) -> float | None:
+        """APY of the latest strategy of a vault, or None if it has no strategy yet."""
+        latest_strategy = (
+            await VaultsStrategy.find(VaultsStrategy.vault.id == vault_id)  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType, reportAttributeAccessIssue]
+            .sort(-VaultsStrategy.update_at)  # pyright: ignore[reportOperatorIssue, reportUnknownArgumentType]
+            .first_or_none()
+        )
+        return latest_strategy.apy if latest_strategy else None
+
+    @staticmethod
+    async def get_balance_checkpoint(
+        user_id: UUID, vault_id: UUID
+    ) -> UserBalanceHistory | None:
+        """Latest balance record of a position, i.e. its last checkpoint."""
+        return (
             await UserBalanceHistory.find(
                 And(
-                    UserBalanceHistory.user.id == user.id,  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType, reportAttributeAccessIssue]
-                    UserBalanceHistory.vault.id == vault.id,  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType, reportAttributeAccessIssue]
+                    UserBalanceHistory.user.id == user_id,  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType, reportAttributeAccessIssue]
+                    UserBalanceHistory.vault.id == vault_id,  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType, reportAttributeAccessIssue]
                 )
             )
             .sort(-UserBalanceHistory.update_at)
             .first_or_none()
         )
-        return (
-            user_balance.remaining_balance + user_balance.earnings
-            if user_balance
-            else 0.0
+
+    @staticmethod
+    async def get_current_earnings(
+        checkpoint: UserBalanceHistory, vault_id: UUID, now: datetime
+    ) -> float:
+        """Earnings of a position at `now`, accrued on read from its last checkpoint.
+
+        The checkpoint balance earns the checkpoint APY from `update_at` to `now`.
+        Checkpoints written before the APY was recorded earn the latest vault APY.
+        """
+        apy = checkpoint.apy
+        if apy is None:
+            apy = await UserOperations.get_latest_vault_apy(vault_id) or 0.0
+        return checkpoint.earnings + accrue_earnings(
+            checkpoint.remaining_balance,
+            apy,
+            elapsed_hours(checkpoint.update_at, now),
         )
 
     @staticmethod
-    async def get_user_balance_earnings(user_wallet: str, vault_name: str) -> float:
+    async def get_user_balance_nav(user_wallet: str, vault_name: str) -> float:
         user = await UserMetadata.find_one(UserMetadata.wallet_address == user_wallet)
         if not user:
             raise ResourceNotFound(f"User with wallet {user_wallet} not found.")
         vault = await VaultsMetadata.find_one(VaultsMetadata.name == vault_name)
         if not vault:
             raise ResourceNotFound(f"Vault with name {vault_name} not found.")
-        user_balance = (
-            await UserBalanceHistory.find(
-                And(
-                    UserBalanceHistory.user.id == user.id,
-                    UserBalanceHistory.vault.id == vault.id,
-                )
-            )
-            .sort(-UserBalanceHistory.update_at)
-            .first_or_none()
+        user_balance = await UserOperations.get_balance_checkpoint(user.id, vault.id)
+        if not user_balance:
+            return 0.0
+        earnings = await UserOperations.get_current_earnings(
+            user_balance, vault.id, datetime.utcnow()
         )
-        return user_balance.earnings if user_balance else 0.0
+        return user_balance.remaining_balance + earnings
 
     @staticmethod
-    async def update_user_balance_earnings(
-        user_wallet: str, vault_name: str, time_interval: float = 6.0
-    ):
+    async def get_user_balance_earnings(user_wallet: str, vault_name: str) -> float:
         user = await UserMetadata.find_one(UserMetadata.wallet_address == user_wallet)
         if not user:
             raise ResourceNotFound(f"User with wallet {user_wallet} not found.")
         vault = await VaultsMetadata.find_one(VaultsMetadata.name == vault_name)
         if not vault:
             raise ResourceNotFound(f"Vault with name {vault_name} not found.")
-        vault_strategy = (
-            await VaultsStrategy.find(VaultsStrategy.vault.id == vault.id)
-            .sort(-VaultsStrategy.update_at)
-            .first_or_none()
+        user_balance = await UserOperations.get_balance_checkpoint(user.id, vault.id)
+        if not user_balance:
+            return 0.0
+        return await UserOperations.get_current_earnings(
+            user_balance, vault.id, datetime.utcnow()
         )
-        if not vault_strategy:
+
+    @staticmethod
+    async def update_user_balance_earnings(user_wallet: str, vault_name: str):
+        """Checkpoint the earnings accrued by one position since its last checkpoint."""
+        user = await UserMetadata.find_one(UserMetadata.wallet_address == user_wallet)
+        if not user:
+            raise ResourceNotFound(f"User with wallet {user_wallet} not found.")
+        vault = await VaultsMetadata.find_one(VaultsMetadata.name == vault_name)
+        if not vault:
+            raise ResourceNotFound(f"Vault with name {vault_name} not found.")
+        vault_apy = await UserOperations.get_latest_vault_apy(vault.id)
+        if vault_apy is None:
             raise ResourceNotFound(f"Vault strategy for {vault_name} not found.")
 
-        user_balance = (
-            await UserBalanceHistory.find(
-                And(
-                    UserBalanceHistory.user.id == user.id,
-                    UserBalanceHistory.vault.id == vault.id,
-                )
-            )
-            .sort(-UserBalanceHistory.update_at)
-            .first_or_none()
-        )
+        user_balance = await UserOperations.get_balance_checkpoint(user.id, vault.id)
         if not user_balance:
             raise ResourceNotFound(
                 f"No balance record found for user {user_wallet} in vault {vault_name}."
             )
-        # Simple interest calculation for demonstration purposes
-        interest_rate = vault_strategy.apy
-        earnings = (
-            user_balance.remaining_balance * (interest_rate / 365 / 24) * time_interval
+        updated_at = datetime.utcnow()
+        earnings = await UserOperations.get_current_earnings(
+            user_balance, vault.id, updated_at
         )
-        updated_time = datetime.utcnow().isoformat()
+        updated_time = updated_at.isoformat()
         new_user_balance = UserBalanceHistory(
             id=hasher.get_hash(f"{user.id}-{vault.id}-{updated_time}-earnings"),
             user=user,
             vault=vault,
             remaining_balance=user_balance.remaining_balance,
-            earnings=user_balance.earnings + earnings,
+            earnings=earnings,
             update_at=updated_time,
+            apy=vault_apy,
+        )
+        _ = await new_user_balance.save()
+        logger.info(
+            f"User {user_wallet} earnings in vault {vault_name} updated by"
+            f" {earnings - user_balance.earnings:.4f}."
+        )
+
+    @staticmethod
+    async def checkpoint_positions(
+        vault_id: UUID | None = None,
+        new_apys: dict[UUID, float] | None = None,
+        checkpoint_at: datetime | None = None,
+    ) -> EarningsAccrual:
+        """Checkpoint every open position, or the positions of one vault, in one pass.
+
+        Each position earns its checkpoint APY from its last checkpoint to
+        `checkpoint_at`, and the new checkpoint records the APY the vault earns
+        from then on. The latest balance of each (user, vault) and the latest APY
+        of each vault are read with one aggregation each, and the checkpoints are
+        written with a single unordered `bulk_write`. Positions without balance
+        and positions of vaults without APY are skipped.
+
+        Args:
+            vault_id (UUID, optional): Only checkpoint the positions of this vault.
+            new_apys (dict[UUID, float], optional): APY of each vault from
+                `checkpoint_at` on, when it differs from its latest strategy APY.
+            checkpoint_at (datetime, optional): Time of the checkpoints. Defaults
+                to now.
+        """
+        checkpoint_at = checkpoint_at or datetime.utcnow()
+        latest_balances = [
+            balance
+            for balance in await get_latest_balances(vault_id)
+            if balance.remaining_balance > 0
+        ]
+        latest_apys: dict[UUID, float] = {
+            row["_id"].id: row["apy"]
+            for row in await VaultsStrategy.aggregate(
+                [
+                    {"$match": {"vault.$id": vault_id} if vault_id else {}},
+                    {"$sort": {"update_at": -1}},
+                    {"$group": {"_id": "$vault", "apy": {"$first": "$apy"}}},
+                ]
+            ).to_list()
+        }
+        checkpoint_apys = latest_apys | (new_apys or {})
+
+        positions = [
+            balance
+            for balance in latest_balances
+            if balance.vault_id in checkpoint_apys
+        ]
+        earnings = accrue_earnings_batch(
+            [balance.remaining_balance for balance in positions],
+            [
+                balance.apy
+                if balance.apy is not None
+                else latest_apys.get(balance.vault_id, 0.0)
+                for balance in positions
+            ],
+            [elapsed_hours(balance.update_at, checkpoint_at) for balance in positions],
         )
-        _ = await user_balance.save()
+
+        user_collection = UserMetadata.get_collection_name()
+        vault_collection = VaultsMetadata.get_collection_name()
+        requests: list[InsertOne[dict[str, Any]]] = []
+        for balance, position_earnings in zip(positions, earnings.tolist()):
+            requests.append(
+                InsertOne(
+                    {
+                        "_id": hasher.get_hash(
+                            f"{balance.user_id}-{balance.vault_id}-{checkpoint_at.isoformat()}-earnings"
+                        ),
+                        "user": DBRef(user_collection, balance.user_id),
+                        "vault": DBRef(vault_collection, balance.vault_id),
+                        "remaining_balance": balance.remaining_balance,
+                        "earnings": balance.earnings + position_earnings,
+                        "update_at": checkpoint_at,
+                        "apy": checkpoint_apys[balance.vault_id],
+                    }
+                )
+            )
+        if requests:
+            _ = await UserBalanceHistory.get_motor_collection().bulk_write(
+                requests, ordered=False
+            )
+        skipped = len(latest_balances) - len(positions)
+        total_earnings = float(earnings.sum())
         logger.info(
-            f"User {user_wallet} earnings in vault {vault_name} updated by {earnings:.4f}."
+            f"Checkpointed {total_earnings:.4f} earnings on {len(requests)} positions"
+            f" ({skipped} skipped without strategy)."
+        )
+        return EarningsAccrual(
+            positions=len(requests),
+            skipped_positions=skipped,
+            total_earnings=total_earnings,
         )
 
+    @staticmethod
+    async def accrue_all_earnings(vault_name: str | None = None) -> EarningsAccrual:
+        """Checkpoint the earnings accrued by every open position up to now.
+
+        Earnings are computed on read from the last checkpoint, so this is not
+        needed to keep balances current; it only materializes them.
+
+        Args:
+            vault_name (str, optional): Only accrue the positions of this vault.
+
+        Raises:
+            ResourceNotFound: If `vault_name` is given and does not exist.
+        """
+        vault_id: UUID | None = None
+        if vault_name is not None:
+            vault = await VaultsMetadata.find_one(VaultsMetadata.name == vault_name)
+            if not vault:
+                raise ResourceNotFound(f"Vault with name {vault_name} not found.")
+            vault_id = vault.id
+        return await UserOperations.checkpoint_positions(vault_id)
+
     @staticmethod
     async def get_vault_ranking() -> dict[int, VaultAPY]:
         all_vault_names = [
@@ -1,6 +1,5 @@
 # llm/strategy_updated.py
 
-import json
 import os
 from string import Template
 
@@ -10,6 +9,7 @@ from google.genai import types
 
 from configs import get_logger
 from mongo.schemas import UpdatedInfo, VaultsStrategy
+from services import json_codec
 
 _ = load_dotenv()
 logger = get_logger("strategy_changes_by_llm")
@@ -95,8 +95,8 @@ def get_strategy_changes(
 ) -> UpdatedInfo:
     try:
         prompt = PROMPT_TPL.substitute(
-            last=json.dumps(last_strategy.strategy.model_dump(), ensure_ascii=False),
-            new=json.dumps(new_strategy.strategy.model_dump(), ensure_ascii=False),
+            last=json_codec.dumps_str(last_strategy.strategy.model_dump()),
+            new=json_codec.dumps_str(new_strategy.strategy.model_dump()),
         )
         response = client.models.generate_content(
             model="gemini-2.5-flash-lite",
@@ -126,7 +126,7 @@ def get_strategy_changes(
         if not hasattr(resp, "text") or not resp.text:
             raise ValueError("No text content received from the model")
 
-        data = json.loads(resp.text)
+        data = json_codec.loads(resp.text)
         return UpdatedInfo.model_validate(data)
     except Exception as e:
         logger.error(f"Error: {e}")
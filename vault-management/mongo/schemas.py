@@ -18,12 +18,6 @@ class APYStatistics(BaseModel):
     count: int | None
 
 
-class PoolCharts(BaseModel):
-    timestamp: datetime
-    tvlUsd: float | None
-    apy: float | None
-
-
 class PoolsSnapshot(Document):
     id: UUID
     chain: str
@@ -33,13 +27,31 @@ class PoolsSnapshot(Document):
     pool_name: str
     predictions: Predictions
     apy_statistics: APYStatistics
-    pool_charts_30d: list[PoolCharts]
 
     class Settings:
         name = "pools_snapshot_v1"
         validate_on_save = True
 
 
+class PoolsLatest(Document):
+    pool_name: str
+    snapshot_id: UUID
+    update_at: datetime
+    chain: str
+    project: str
+    symbol: str
+    predictions: Predictions
+    apy_statistics: APYStatistics
+    apyPct1D: float | None = None
+    apyPct7D: float | None = None
+    apyPct30D: float | None = None
+    tvlUsd: float | None = None
+    apy: float | None = None  # latest apy
+
+    class Settings:
+        name = "pools_latest"
+
+
 class PoolsMetdadata(Document):
     id: UUID
     defillama_id: str | None
@@ -160,14 +172,17 @@ class UserBalanceHistory(Document):
     remaining_balance: float
     earnings: float
     update_at: datetime
+    apy: float | None = None  # vault APY accruing since update_at, unset on older rows
 
     class Settings:
         name = "users_balance_history"
         validate_on_save = True
+        indexes = [[("user", 1), ("vault", 1), ("update_at", -1)]]
 
 
 DocumentModels = [
     PoolsSnapshot,
+    PoolsLatest,
     VaultsStrategy,
     VaultsHistory,
     VaultsUpdated,
@@ -0,0 +1,37 @@
+"""Time batch accrual against the scalar version on random positions.
+
+Run from vault-management with `python -m scripts.bench_accrual`.
+"""
+
+import time
+
+import numpy as np
+
+from backend.accrual import accrue_earnings, accrue_earnings_batch
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    n = 2_000_000
+    balances = rng.lognormal(mean=7, sigma=2, size=n)
+    apys = rng.uniform(0, 30, size=n)
+    hours = rng.choice([1.0, 6.0, 24.0, 0.5], size=n)
+
+    start = time.perf_counter()
+    _ = accrue_earnings_batch(balances, apys, hours)
+    batch_seconds = time.perf_counter() - start
+
+    sample = rng.choice(n, size=200_000, replace=False)
+    start = time.perf_counter()
+    _ = [
+        accrue_earnings(float(balances[i]), float(apys[i]), float(hours[i]))
+        for i in sample
+    ]
+    scalar_seconds = (time.perf_counter() - start) * n / len(sample)
+
+    print(f"{n} positions: batch {batch_seconds * 1e3:.1f} ms")
+    print(f"{n} positions: scalar ~{scalar_seconds * 1e3:.0f} ms (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
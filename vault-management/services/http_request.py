@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-import json
 from enum import Enum
 from typing import Any
 
 import aiohttp
-import ujson
 from aiohttp import ClientError, ClientSession, ClientTimeout
 from requests import Session
 from requests.exceptions import RequestException
@@ -16,6 +14,7 @@ from hooks.error import (
     GenericServiceError,
     ServicesAuthenticationError,
 )
+from services import json_codec
 from services.base_singleton import SingletonMeta
 
 logger = get_logger("http_client")
@@ -42,7 +41,9 @@ class HTTPClient(metaclass=SingletonMeta):
     async def get_aiohttp_session(self) -> ClientSession:
         if self._aiohttp_session is None or self._aiohttp_session.closed:
             timeout = ClientTimeout(total=30)
-            self._aiohttp_session = aiohttp.ClientSession(timeout=timeout)
+            self._aiohttp_session = aiohttp.ClientSession(
+                timeout=timeout, json_serialize=json_codec.dumps_str
+            )
         return self._aiohttp_session
 
     def get_requests_session(self) -> Session:
@@ -126,16 +127,17 @@ class HTTPClient(metaclass=SingletonMeta):
                 if method == HTTPMethod.GET:
                     response = session.get(url, params=params)
                 elif method == HTTPMethod.POST:
-                    response = session.post(url, params=params, json=data)
+                    response = session.post(
+                        url, params=params, **self._encode_body(data)
+                    )
                 elif method == HTTPMethod.PUT:
-                    response = session.put(url, params=params, json=data)
+                    response = session.put(
+                        url, params=params, **self._encode_body(data)
+                    )
                 elif method == HTTPMethod.DELETE:
                     response = session.delete(url, params=params)
 
-                try:
-                    response_data = response.json()
-                except json.JSONDecodeError:
-                    raise FailedExternalAPI(f"Invalid JSON response from {url}")
+                response_data = self._decode_json(url, response.content)
 
                 self._handle_response_error(response.status_code, url, response_data)
                 return response_data
@@ -184,22 +186,30 @@ class HTTPClient(metaclass=SingletonMeta):
                     async with session.get(
                         url, headers=headers, params=params
                     ) as response:
-                        response_data = await response.json()
+                        response_data = self._decode_json(
+                            url, await response.read()
+                        )
                 elif method == HTTPMethod.POST:
                     async with session.post(
                         url, headers=headers, params=params, json=data
                     ) as response:
-                        response_data = await response.json()
+                        response_data = self._decode_json(
+                            url, await response.read()
+                        )
                 elif method == HTTPMethod.PUT:
                     async with session.put(
                         url, headers=headers, params=params, json=data
                     ) as response:
-                        response_data = await response.json()
+                        response_data = self._decode_json(
+                            url, await response.read()
+                        )
                 elif method == HTTPMethod.DELETE:
                     async with session.delete(
                         url, headers=headers, params=params
                     ) as response:
-                        response_data = await response.json()
+                        response_data = self._decode_json(
+                            url, await response.read()
+                        )
 
                 self._handle_response_error(response.status, url, response_data)
                 return response_data
@@ -213,6 +223,21 @@ class HTTPClient(metaclass=SingletonMeta):
                         f"Async HTTP request to {url} failed after {self._max_retries} retries: {e}"
                     )
 
+    @staticmethod
+    def _encode_body(data: dict[str, Any]) -> dict[str, Any]:
+        """Keyword arguments sending `data` as a JSON body with `requests`."""
+        return {
+            "data": json_codec.dumps(data),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    @staticmethod
+    def _decode_json(url: str, body: bytes) -> Any:
+        try:
+            return json_codec.loads(body)
+        except ValueError:
+            raise FailedExternalAPI(f"Invalid JSON response from {url}")
+
     @staticmethod
     def _normalize_params(params: dict[str, Any]) -> dict[str, str]:
         """
@@ -230,7 +255,7 @@ class HTTPClient(metaclass=SingletonMeta):
             elif isinstance(v, bool):
                 result[k] = str(v).lower()
             elif isinstance(v, (dict, list)):
-                result[k] = ujson.dumps(v)
+                result[k] = json_codec.dumps_str(v)
             else:
                 result[k] = str(v)
 
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.accrual import accrue_earnings, accrue_earnings_batch, elapsed_hours
+
+
+def _random_checkpoints(seed: int, n: int):
+    rng = np.random.default_rng(seed)
+    balances = rng.lognormal(mean=7, sigma=2, size=n)
+    apys = rng.uniform(0, 30, size=n)
+    since = datetime(2025, 1, 1)
+    hours = np.array(
+        [
+            elapsed_hours(since, since + timedelta(seconds=int(seconds)))
+            for seconds in rng.integers(0, 7 * 24 * 3600, size=n)
+        ]
+    )
+    return balances, apys, hours
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_scalar(seed: int):
+    balances, apys, hours = _random_checkpoints(seed, 10_000)
+
+    batch = accrue_earnings_batch(balances, apys, hours)
+    scalar = np.array(
+        [
+            accrue_earnings(float(b), float(a), float(h))
+            for b, a, h in zip(balances, apys, hours)
+        ]
+    )
+
+    assert np.array_equal(batch, scalar)
+
+
+def test_batch_broadcasts_scalars():
+    balances, apys, hours = _random_checkpoints(0, 1_000)
+
+    batch = accrue_earnings_batch(balances, float(apys[0]), float(hours[0]))
+    scalar = [
+        accrue_earnings(float(b), float(apys[0]), float(hours[0])) for b in balances
+    ]
+
+    assert np.array_equal(batch, np.array(scalar))
+
+
+def test_elapsed_hours_is_never_negative():
+    since = datetime(2025, 1, 1)
+
+    assert elapsed_hours(since, since - timedelta(hours=1)) == 0.0
+    assert elapsed_hours(since, since + timedelta(minutes=90)) == 1.5